@@ -15,7 +15,7 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from sim_modbus import main as example_with_simulator
+from sim_modbus import get_loop_factory, main as example_with_simulator
 
 
 async def main():
@@ -41,5 +41,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=get_loop_factory()) as runner:
+        runner.run(main())
 
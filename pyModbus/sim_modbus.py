@@ -17,12 +17,15 @@ import asyncio
 import logging
 import random
 import struct
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 
 # 第三方库导入
 try:
     from pymodbus.client import AsyncModbusTcpClient
+    from pymodbus.constants import ExcCodes
     from pymodbus.exceptions import ModbusException
     from pymodbus.pdu import ExceptionResponse
     # 服务器组件
@@ -37,6 +40,14 @@ except ImportError as e:
     print("请运行: pip install 'pymodbus>=3.5.0'")
     exit(1)
 
+# 可选的批量解码加速 (numba / numpy)
+import fast_convert
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # ==================== 日志配置 ====================
 logging.basicConfig(
     level=logging.INFO,
@@ -62,37 +73,112 @@ class AppConfig:
     REG_CURRENT = 2  # 10A  (占用 2 个寄存器)
     REG_POWER = 4    # 2200W (占用 2 个寄存器)
 
+    # 批量解码: 浮点数个数达到该值且安装了 numpy/numba 时使用加速实现
+    FAST_CONVERT_MIN_FLOATS = 64
+
+    # 请求合并配置
+    READ_MERGE_GAP = 8     # 间隔不超过该值的读请求合并为一个 PDU (寄存器数)
+    MAX_READ_COUNT = 125   # 单个读请求最多寄存器数 (Modbus 协议上限)
+
+# ==================== 数据模型 ====================
+@dataclass(slots=True)
+class Sample:
+    """单次采集结果，读取失败的字段为 None"""
+    voltage: Optional[float]
+    current: Optional[float]
+    power: Optional[float]
+
+    @property
+    def is_empty(self) -> bool:
+        """是否所有指标都读取失败"""
+        return self.voltage is None and self.current is None and self.power is None
+
 # ==================== 工具类 ====================
+# 预编译的 Struct 对象，避免每次调用重新解析格式字符串
+# '>f': Big-Endian float, '>HH': 2 * Big-Endian unsigned short
+_PACK_F = struct.Struct('>f').pack
+_UNPACK_F = struct.Struct('>f').unpack_from
+_PACK_HH = struct.Struct('>HH').pack
+_UNPACK_HH = struct.Struct('>HH').unpack_from
+# 电压/电流/功率 3 个连续 float 的就地写入
+_PACK_SAMPLE_INTO = struct.Struct('>fff').pack_into
+
+
+@lru_cache(maxsize=32)
+def _bulk_structs(n_floats: int) -> tuple:
+    """按浮点数个数缓存 (2N * uint16, N * float) 的 Struct 对象"""
+    return struct.Struct(f'>{2 * n_floats}H'), struct.Struct(f'>{n_floats}f')
+
+
+@lru_cache(maxsize=64)
+def _reg_struct(count: int) -> struct.Struct:
+    """按寄存器个数缓存 count * uint16 的 Struct 对象"""
+    return struct.Struct(f'>{count}H')
+
+
 class DataConverter:
     """数据转换工具：处理浮点数与寄存器(16位整数)之间的转换"""
     
     @staticmethod
     def float_to_registers(value: float) -> List[int]:
         """float (32位) -> 2 * uint16"""
-        # '>f': Big-Endian float
-        packed = struct.pack('>f', value)
-        # '>HH': 2 * Big-Endian unsigned short
-        return list(struct.unpack('>HH', packed))
+        return list(_UNPACK_HH(_PACK_F(value)))
 
     @staticmethod
     def registers_to_float(registers: List[int]) -> float:
         """2 * uint16 -> float (32位)"""
         if len(registers) < 2:
             raise ValueError("Need at least 2 registers for float")
-        packed = struct.pack('>HH', registers[0], registers[1])
-        return struct.unpack('>f', packed)[0]
+        return _UNPACK_F(_PACK_HH(registers[0], registers[1]))[0]
+
+    @staticmethod
+    def registers_to_floats(registers: List[int]) -> List[float]:
+        """2N * uint16 -> N * float (32位)，一次 pack + 一次 unpack 完成批量转换"""
+        n_floats = len(registers) // 2
+        if n_floats == 0:
+            return []
+        if n_floats >= AppConfig.FAST_CONVERT_MIN_FLOATS and fast_convert.HAS_NUMPY:
+            return fast_convert.registers_to_floats(registers[:2 * n_floats])
+        regs_struct, floats_struct = _bulk_structs(n_floats)
+        return list(floats_struct.unpack(regs_struct.pack(*registers[:2 * n_floats])))
+
+    @staticmethod
+    def floats_to_registers(values: List[float]) -> List[int]:
+        """N * float (32位) -> 2N * uint16，用于一次性写入连续寄存器"""
+        if not values:
+            return []
+        regs_struct, floats_struct = _bulk_structs(len(values))
+        return list(regs_struct.unpack(floats_struct.pack(*values)))
+
+async def cancel_task(task: Optional[asyncio.Task]):
+    """取消任务并等待其结束 (直接 await，无需 gather 包装)"""
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
 
 # ==================== Modbus 客户端 ====================
 class ModbusClientWrapper:
     """封装 pymodbus 客户端，处理连接和重连逻辑"""
+
+    __slots__ = (
+        "host", "port", "slave_id", "client",
+        "_connected", "_tx_queue", "_tx_task", "_loop",
+    )
     
     def __init__(self, host: str, port: int, slave_id: int):
         self.host = host
         self.port = port
         self.slave_id = slave_id
         self.client: Optional[AsyncModbusTcpClient] = None
-        self._lock = asyncio.Lock()
         self._connected = False
+        # 请求队列: (address, count, values, future)，values 为 None 表示读请求
+        self._tx_queue: asyncio.Queue = asyncio.Queue()
+        self._tx_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def connect(self) -> bool:
         """建立连接"""
@@ -121,6 +207,14 @@ class ModbusClientWrapper:
 
     async def disconnect(self):
         """断开连接"""
+        await cancel_task(self._tx_task)
+        self._tx_task = None
+        # 未处理的请求直接返回失败，避免调用方永久等待
+        while not self._tx_queue.empty():
+            _, count, values, fut = self._tx_queue.get_nowait()
+            if not fut.done():
+                fut.set_result(None if values is None else False)
+
         if self.client:
             self.client.close()
             self._connected = False
@@ -128,7 +222,8 @@ class ModbusClientWrapper:
 
     async def ensure_connected(self) -> bool:
         """确保连接可用，自动重连"""
-        if self._connected and self.client and self.client.connected:
+        # 快速路径: 只检查一个标志，读写异常时会将其置为 False 触发重连
+        if self._connected:
             return True
         
         logger.info("🔄 尝试重新连接...")
@@ -139,66 +234,169 @@ class ModbusClientWrapper:
         
         return False
 
-    async def read_float(self, address: int) -> Optional[float]:
-        """读取浮点数 (跨越2个寄存器)"""
-        async with self._lock:
-            if not await self.ensure_connected():
+    # ---------- 请求管道 ----------
+    async def _submit(self, address: int, count: int, values: Optional[List[int]] = None) -> Any:
+        """提交请求到发送队列并等待结果"""
+        if self._tx_task is None or self._tx_task.done():
+            # 发送任务与事件循环绑定，启动时缓存循环引用供后续请求复用
+            self._loop = asyncio.get_running_loop()
+            self._tx_task = self._loop.create_task(self._pump())
+
+        fut = self._loop.create_future()
+        await self._tx_queue.put((address, count, values, fut))
+        return await fut
+
+    async def _pump(self):
+        """
+        后台发送任务：唯一的 Modbus 事务执行者
+        每轮取出同一事件循环 tick 内积压的所有请求，合并相邻读请求后串行发送
+        """
+        while True:
+            batch = [await self._tx_queue.get()]
+            while True:
+                try:
+                    batch.append(self._tx_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            reads = []
+            for item in batch:
+                if item[2] is None:
+                    reads.append(item)
+                    continue
+                # 写请求作为屏障：先发送之前累积的读请求，保持提交顺序语义
+                await self._dispatch_reads(reads)
+                reads = []
+                await self._dispatch_write(item)
+            await self._dispatch_reads(reads)
+
+    async def _dispatch_reads(self, reads: list):
+        """按地址排序并合并相邻区间，每个区间只发送一次读请求"""
+        if not reads:
+            return
+
+        reads.sort(key=lambda item: item[0])
+        groups = []  # [start, end, members]
+        for item in reads:
+            address, count = item[0], item[1]
+            if groups:
+                group = groups[-1]
+                new_end = max(group[1], address + count)
+                if (address - group[1] <= AppConfig.READ_MERGE_GAP
+                        and new_end - group[0] <= AppConfig.MAX_READ_COUNT):
+                    group[1] = new_end
+                    group[2].append(item)
+                    continue
+            groups.append([address, address + count, [item]])
+
+        for start, end, members in groups:
+            registers = await self._read_registers(start, end - start)
+            for address, count, _, fut in members:
+                if fut.done():  # 调用方已取消
+                    continue
+                if registers is None:
+                    fut.set_result(None)
+                else:
+                    fut.set_result(registers[address - start:address - start + count])
+
+    async def _dispatch_write(self, item: tuple):
+        """执行单个写请求"""
+        address, _, values, fut = item
+        result = await self._write_registers(address, values)
+        if not fut.done():
+            fut.set_result(result)
+
+    async def _read_registers(self, address: int, count: int) -> Optional[List[int]]:
+        """读取连续保持寄存器 (仅由发送任务调用)"""
+        if not await self.ensure_connected():
+            return None
+
+        try:
+            # read_holding_registers(address, count, slave)
+            # pymodbus 3.x (newer versions) uses device_id instead of slave
+            response = await self.client.read_holding_registers(
+                address=address,
+                count=count,
+                # slave=self.slave_id  # Old 3.x
+                device_id=self.slave_id  # New 3.11+
+            )
+
+            if response.isError():
+                logger.warning(f"⚠️ 读取错误 (Addr {address}, Count {count}): {response}")
                 return None
-            
-            try:
-                # read_holding_registers(address, count, slave)
-                # pymodbus 3.x (newer versions) uses device_id instead of slave
-                response = await self.client.read_holding_registers(
-                    address=address,
-                    count=2,
-                    # slave=self.slave_id  # Old 3.x
-                    device_id=self.slave_id  # New 3.11+
-                )
-                
-                if response.isError():
-                    logger.warning(f"⚠️ 读取错误 (Addr {address}): {response}")
-                    return None
-                
-                if isinstance(response, ExceptionResponse):
-                    logger.warning(f"⚠️ 异常响应 (Addr {address}): {response}")
-                    return None
 
-                return DataConverter.registers_to_float(response.registers)
-                
-            except ModbusException as e:
-                logger.error(f"❌ Modbus 协议异常: {e}")
-                self._connected = False # 标记断开，触发重连
+            if isinstance(response, ExceptionResponse):
+                logger.warning(f"⚠️ 异常响应 (Addr {address}, Count {count}): {response}")
                 return None
-            except Exception as e:
-                logger.error(f"❌ 读取异常: {e}")
+
+            if len(response.registers) < count:
+                logger.warning(f"⚠️ 读取数据不完整 (Addr {address}): {len(response.registers)} 个寄存器")
                 return None
 
+            return response.registers
+
+        except ModbusException as e:
+            logger.error(f"❌ Modbus 协议异常: {e}")
+            self._connected = False # 标记断开，触发重连
+            return None
+        except Exception as e:
+            logger.error(f"❌ 读取异常: {e}")
+            self._connected = False
+            return None
+
+    async def _write_registers(self, address: int, values: List[int]) -> bool:
+        """写入连续保持寄存器 (仅由发送任务调用)"""
+        if not await self.ensure_connected():
+            return False
+
+        try:
+            response = await self.client.write_registers(
+                address=address,
+                values=values,
+                # slave=self.slave_id
+                device_id=self.slave_id
+            )
+
+            if response.isError() or isinstance(response, ExceptionResponse):
+                logger.warning(f"⚠️ 写入失败 (Addr {address})")
+                return False
+
+            return True
+        except Exception as e:
+            logger.error(f"❌ 写入异常: {e}")
+            self._connected = False
+            return False
+
+    # ---------- 对外接口 ----------
+    async def read_float(self, address: int) -> Optional[float]:
+        """读取浮点数 (跨越2个寄存器)"""
+        registers = await self._submit(address, 2)
+        if registers is None:
+            return None
+        return DataConverter.registers_to_float(registers)
+
+    async def read_floats_block(self, address: int, n_floats: int) -> List[Optional[float]]:
+        """批量读取连续的浮点数 (一次请求读取 2 * n_floats 个寄存器)"""
+        registers = await self._submit(address, 2 * n_floats)
+        if registers is None:
+            return [None] * n_floats
+        return DataConverter.registers_to_floats(registers)
+
+    async def read_sample(self, address: int = AppConfig.REG_VOLTAGE) -> Sample:
+        """读取一组 电压/电流/功率 (3 个连续浮点数)"""
+        return Sample(*await self.read_floats_block(address, 3))
+
     async def write_float(self, address: int, value: float) -> bool:
         """写入浮点数"""
-        async with self._lock:
-            if not await self.ensure_connected():
-                return False
-            
-            try:
-                registers = DataConverter.float_to_registers(value)
-                response = await self.client.write_registers(
-                    address=address,
-                    values=registers,
-                    # slave=self.slave_id
-                    device_id=self.slave_id
-                )
-                
-                if response.isError() or isinstance(response, ExceptionResponse):
-                    logger.warning(f"⚠️ 写入失败 (Addr {address})")
-                    return False
-                
-                return True
-            except Exception as e:
-                logger.error(f"❌ 写入异常: {e}")
-                self._connected = False
-                return False
+        registers = DataConverter.float_to_registers(value)
+        return await self._submit(address, len(registers), registers)
 
 # ==================== 采集业务逻辑 ====================
+def _fmt(value: Optional[float]) -> str:
+    """格式化采集值，读取失败显示为 —"""
+    return "—" if value is None else f"{value:.2f}"
+
+
 class DeviceCollector:
     """设备数据采集器"""
     
@@ -207,45 +405,43 @@ class DeviceCollector:
         self.client = client
         self.running = False
         self._task: Optional[asyncio.Task] = None
+        # 预绑定每个周期都会调用的日志方法
+        self._log = logger.info
+        self._warn = logger.warning
 
-    async def collect_cycle(self):
+    async def collect_cycle(self) -> Sample:
         """单次采集周期"""
-        # 并发读取多个指标
-        v_task = self.client.read_float(AppConfig.REG_VOLTAGE)
-        c_task = self.client.read_float(AppConfig.REG_CURRENT)
-        p_task = self.client.read_float(AppConfig.REG_POWER)
-        
-        results = await asyncio.gather(v_task, c_task, p_task, return_exceptions=True)
-        
-        # 解析结果
-        voltage = results[0] if not isinstance(results[0], Exception) else None
-        current = results[1] if not isinstance(results[1], Exception) else None
-        power = results[2] if not isinstance(results[2], Exception) else None
-        
-        log_msg = f"📊 [{self.name}] "
-        if voltage is not None: log_msg += f"电压: {voltage:.2f}V | "
-        if current is not None: log_msg += f"电流: {current:.2f}A | "
-        if power is not None:   log_msg += f"功率: {power:.2f}W"
-        
-        if voltage is None and current is None and power is None:
-            logger.warning(f"⚠️ [{self.name}] 采集失败: 无法获取数据")
-        else:
-            logger.info(log_msg)
+        # 电压/电流/功率寄存器地址连续 (0..5)，一次请求读取全部指标
+        sample = await self.client.read_sample(AppConfig.REG_VOLTAGE)
+
+        if sample.is_empty:
+            self._warn("⚠️ [%s] 采集失败: 无法获取数据", self.name)
+        elif logger.isEnabledFor(logging.INFO):
+            # %-格式延迟到日志实际输出时才拼接
+            self._log(
+                "📊 [%s] 电压: %sV | 电流: %sA | 功率: %sW",
+                self.name, _fmt(sample.voltage), _fmt(sample.current), _fmt(sample.power)
+            )
+        return sample
 
     async def start(self):
         """启动持续采集"""
         self.running = True
         logger.info(f"🚀 [{self.name}] 开始采集任务 (间隔 {AppConfig.COLLECT_INTERVAL}s)")
         
+        # 按绝对截止时间调度，避免周期误差累积漂移
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         while self.running:
             try:
-                start_time = asyncio.get_running_loop().time()
+                deadline += AppConfig.COLLECT_INTERVAL
                 await self.collect_cycle()
-                elapsed = asyncio.get_running_loop().time() - start_time
-                
-                # 计算剩余等待时间，保持固定周期
-                wait_time = max(0.1, AppConfig.COLLECT_INTERVAL - elapsed)
-                await asyncio.sleep(wait_time)
+
+                now = loop.time()
+                if now > deadline:
+                    # 本周期超时，跳过错过的节拍而不是连续补采
+                    deadline = now
+                await asyncio.sleep(deadline - now)
                 
             except asyncio.CancelledError:
                 logger.info(f"🛑 [{self.name}] 采集任务已取消")
@@ -253,12 +449,95 @@ class DeviceCollector:
             except Exception as e:
                 logger.error(f"❌ [{self.name}] 循环异常: {e}")
                 await asyncio.sleep(1.0) # 出错后稍作等待
+                deadline = loop.time()
 
     def stop(self):
         """停止采集"""
         self.running = False
         logger.info(f"🛑 正在停止 [{self.name}]...")
 
+# ==================== 数据存储 ====================
+class FastHoldingBlock(ModbusSequentialDataBlock):
+    """
+    bytearray 存储的保持寄存器块
+    寄存器以 Big-Endian uint16 连续存放，读写直接操作缓冲区，避免逐元素的 list 赋值
+    """
+
+    def __init__(self, address: int, count: int):
+        self.address = address
+        self.default_value = 0
+        self._count = count
+        self._buf = bytearray(2 * count)
+        # 缓冲区的零拷贝视图，可配合 struct.pack_into 直接写入
+        self.view = memoryview(self._buf)
+
+    @property
+    def values(self) -> List[int]:
+        """兼容基类接口：以 list 形式返回全部寄存器"""
+        return list(_reg_struct(self._count).unpack_from(self._buf, 0))
+
+    def reset(self):
+        """清零全部寄存器"""
+        self._buf[:] = bytes(len(self._buf))
+
+    def _offset(self, address: int, count: int) -> Optional[int]:
+        """地址 -> 缓冲区字节偏移，越界返回 None"""
+        start = address - self.address
+        if start < 0 or start + count > self._count:
+            return None
+        return start * 2
+
+    def getValues(self, address, count=1):
+        offset = self._offset(address, count)
+        if offset is None:
+            return ExcCodes.ILLEGAL_ADDRESS
+        return list(_reg_struct(count).unpack_from(self._buf, offset))
+
+    def setValues(self, address, values):
+        if not isinstance(values, list):
+            values = [values]
+        offset = self._offset(address, len(values))
+        if offset is None:
+            return ExcCodes.ILLEGAL_ADDRESS
+        _reg_struct(len(values)).pack_into(self._buf, offset, *values)
+        return None
+
+    def set_floats(self, address: int, floats: List[float]):
+        """直接写入 Big-Endian float (每个占 2 个寄存器)，跳过寄存器中间转换"""
+        offset = self._offset(address, 2 * len(floats))
+        if offset is None:
+            return ExcCodes.ILLEGAL_ADDRESS
+        _bulk_structs(len(floats))[1].pack_into(self._buf, offset, *floats)
+        return None
+
+class NoiseBuffer:
+    """
+    均匀分布随机噪声缓冲
+    一次批量生成 size 个样本并逐个取用，用尽后重新生成；安装 numpy 时使用其向量化 PRNG
+    """
+
+    def __init__(self, low: float, high: float, size: int = 4096):
+        self.low = low
+        self.high = high
+        self.size = size
+        self._rng = np.random.default_rng() if np is not None else None
+        self._samples = iter(())
+
+    def _refill(self):
+        if self._rng is not None:
+            samples = self._rng.uniform(self.low, self.high, self.size).tolist()
+        else:
+            samples = [random.uniform(self.low, self.high) for _ in range(self.size)]
+        self._samples = iter(samples)
+
+    def next(self) -> float:
+        """取下一个噪声样本"""
+        try:
+            return next(self._samples)
+        except StopIteration:
+            self._refill()
+            return next(self._samples)
+
 # ==================== 模拟服务器 ====================
 class ModbusSimulator:
     """Modbus TCP 模拟服务器"""
@@ -269,17 +548,21 @@ class ModbusSimulator:
         self.running = False
         self.context = None
         self.hr_block = None
+        self._mv: Optional[memoryview] = None
+        self._sample_offset = 0
         self._update_task = None
 
     def _init_store(self):
         """初始化寄存器存储区"""
         # 0-99 的保持寄存器
-        self.hr_block = ModbusSequentialDataBlock(0, [0] * 100)
+        self.hr_block = FastHoldingBlock(0, 100)
         
-        # 初始值
-        self.hr_block.setValues(AppConfig.REG_VOLTAGE, DataConverter.float_to_registers(220.0))
-        self.hr_block.setValues(AppConfig.REG_CURRENT, DataConverter.float_to_registers(10.0))
-        self.hr_block.setValues(AppConfig.REG_POWER,   DataConverter.float_to_registers(2200.0))
+        # 初始值 (电压/电流/功率地址连续，一次写入)
+        self.hr_block.set_floats(AppConfig.REG_VOLTAGE, [220.0, 10.0, 2200.0])
+
+        # 每个周期的数据直接写入缓冲区视图 (电压寄存器起始字节偏移)
+        self._mv = self.hr_block.view
+        self._sample_offset = (AppConfig.REG_VOLTAGE - self.hr_block.address) * 2
         
         store = ModbusDeviceContext(hr=self.hr_block)
         # 这里的 keys 是 slave_id
@@ -290,22 +573,22 @@ class ModbusSimulator:
         logger.info("🎲 数据模拟生成器已启动")
         voltage = 220.0
         current = 10.0
+        voltage_noise = NoiseBuffer(-1.0, 1.0)
+        current_noise = NoiseBuffer(-0.5, 0.5)
         
         while self.running:
             try:
                 # 随机波动
-                voltage += random.uniform(-1.0, 1.0)
-                current += random.uniform(-0.5, 0.5)
+                voltage += voltage_noise.next()
+                current += current_noise.next()
                 
                 # 限制范围
                 voltage = max(210.0, min(230.0, voltage))
                 current = max(0.0, min(20.0, current))
                 power = voltage * current
                 
-                # 更新寄存器
-                self.hr_block.setValues(AppConfig.REG_VOLTAGE, DataConverter.float_to_registers(voltage))
-                self.hr_block.setValues(AppConfig.REG_CURRENT, DataConverter.float_to_registers(current))
-                self.hr_block.setValues(AppConfig.REG_POWER,   DataConverter.float_to_registers(power))
+                # 更新寄存器 (地址 0..5 连续，12 字节就地写入)
+                _PACK_SAMPLE_INTO(self._mv, self._sample_offset, voltage, current, power)
                 
                 await asyncio.sleep(0.5)
             except asyncio.CancelledError:
@@ -338,15 +621,19 @@ class ModbusSimulator:
     async def stop(self):
         """停止服务器"""
         self.running = False
-        if self._update_task:
-            self._update_task.cancel()
-            try:
-                await self._update_task
-            except asyncio.CancelledError:
-                pass
+        await cancel_task(self._update_task)
         logger.info("🛑 模拟服务器停止")
 
 # ==================== 主流程 ====================
+def get_loop_factory():
+    """优先使用 uvloop (基于 libuv) 事件循环，未安装时返回 None 使用默认事件循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 async def main():
     """主程序入口"""
     logger.info("="*40)
@@ -386,29 +673,22 @@ async def main():
         
         # 停止采集
         collector.stop()
-        collector_task.cancel()
-        try:
-            await collector_task
-        except asyncio.CancelledError:
-            pass
+        await cancel_task(collector_task)
             
         # 断开客户端
         await client_wrapper.disconnect()
         
         # 停止服务器
         await simulator.stop()
-        server_task.cancel()
-        try:
-            await server_task
-        except asyncio.CancelledError:
-            pass
+        await cancel_task(server_task)
             
         logger.info("✅ 系统已完全停止")
 
 if __name__ == "__main__":
     try:
         # 运行异步主程序
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=get_loop_factory()) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         # 捕获最外层的 Ctrl+C，避免打印 traceback
         pass
@@ -0,0 +1,10 @@
+-- demo_item 增加所属用户列 user_id（逻辑外键，关联 users.id，不建数据库外键约束）
+--
+-- Base.metadata.create_all 只创建不存在的表，不会给已有表加列；
+-- 已部署的数据库需在发布新版本前执行一次本脚本，否则所有 Item 查询会报 Unknown column 'user_id'
+--
+-- 执行方式: mysql -h <DB_HOST> -u <DB_USER> -p <DB_NAME> < sql/migrations/2026-10-15_demo_item_add_user_id.sql
+
+ALTER TABLE demo_item
+    ADD COLUMN user_id INT NULL COMMENT '所属用户ID（关联 users.id）' AFTER category,
+    ADD INDEX ix_demo_item_user_id (user_id);
@@ -16,6 +16,7 @@ from src.common.database import (
     db_manager,
     get_db,
     get_db_dependency,
+    get_db_readonly,
     get_reporting_db,
     get_system_db,
     get_user_db,
@@ -45,6 +46,9 @@ from src.common.middleware import (
 # 基础模型
 from src.common.models import BaseModel, TimestampMixin
 
+# 响应类
+from src.common.responses import ORJSONResponse, orjson_default
+
 # 分页工具
 from src.common.pagination import (
     PaginationParams,
@@ -57,11 +61,13 @@ from src.common.pagination import (
 from src.common.schemas import (
     CustomModel,
     ErrorResponse,
+    FormattedDateTime,
     IdResponse,
     MessageResponse,
     PageInfo,
     PageResponse,
     ResponseModel,
+    set_fields_dict,
 )
 
 __all__ = [
@@ -77,6 +83,7 @@ __all__ = [
     "DatabaseManager",
     "db_manager",
     "get_db",
+    "get_db_readonly",
     "get_db_dependency",
     "get_user_db",
     "get_system_db",
@@ -98,6 +105,9 @@ __all__ = [
     # 模型
     "BaseModel",
     "TimestampMixin",
+    # 响应类
+    "ORJSONResponse",
+    "orjson_default",
     # 分页
     "PaginationParams",
     "get_pagination",
@@ -105,11 +115,13 @@ __all__ = [
     "get_offset",
     # Schema
     "CustomModel",
+    "FormattedDateTime",
     "ResponseModel",
     "PageResponse",
     "PageInfo",
     "IdResponse",
     "MessageResponse",
     "ErrorResponse",
+    "set_fields_dict",
 ]
 
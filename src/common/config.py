@@ -2,7 +2,7 @@
 全局配置管理
 使用 Pydantic BaseSettings 进行类型安全的配置管理
 """
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Any
 
 from pydantic import model_validator
@@ -11,6 +11,12 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from src.common.constants import Environment
 
 
+@lru_cache(maxsize=8)
+def build_database_url(driver: str, user: str, password: str, host: str, port: int, db_name: str) -> str:
+    """构建 MySQL 连接 URL（按参数缓存）"""
+    return f"mysql+{driver}://{user}:{password}@{host}:{port}/{db_name}?charset=utf8mb4"
+
+
 class Settings(BaseSettings):
     """应用全局配置"""
     model_config = SettingsConfigDict(
@@ -47,13 +53,14 @@ class Settings(BaseSettings):
 
     # ========== 数据库配置 - 主数据库 ==========
     # 重要：这些字段必须在 .env 文件中配置
-    # 对应 .env 中的字段：DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME, DB_ECHO
+    # 对应 .env 中的字段：DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME, DB_ECHO, SQL_LOG_ENABLED
     DB_HOST: str = ""  # .env: DB_HOST
     DB_PORT: int = 3306  # .env: DB_PORT (默认 MySQL 端口)
     DB_USER: str = ""  # .env: DB_USER
     DB_PASSWORD: str = ""  # .env: DB_PASSWORD
     DB_NAME: str = ""  # .env: DB_NAME (默认数据库)
     DB_ECHO: bool = False  # .env: DB_ECHO (是否打印 SQL 语句)
+    SQL_LOG_ENABLED: bool = True  # .env: SQL_LOG_ENABLED (是否把 SQL 语句写入 logs/sql_*.log，关闭后不再准备日志数据)
 
     # ========== 多数据库配置 ==========
     # 来自 .env 文件或环境变量
@@ -64,10 +71,12 @@ class Settings(BaseSettings):
 
     # ========== 数据库连接池配置 ==========
     # 来自 .env 文件或环境变量
-    # 对应 .env 中的字段：DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE
+    # 对应 .env 中的字段：DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
     DB_POOL_SIZE: int = 10  # .env: DB_POOL_SIZE (连接池大小)
     DB_MAX_OVERFLOW: int = 20  # .env: DB_MAX_OVERFLOW (最大溢出连接数)
+    DB_POOL_TIMEOUT: int = 30  # .env: DB_POOL_TIMEOUT (连接池耗尽时等待空闲连接的超时，秒)
     DB_POOL_RECYCLE: int = 1800  # .env: DB_POOL_RECYCLE (连接回收时间，秒)
+    DB_POOL_PRE_PING: bool = False  # .env: DB_POOL_PRE_PING (借出连接前是否 ping，默认依赖回收 + 断线失效)
 
     # ========== InfluxDB 配置 ==========
     # 重要：这些字段建议在 .env 文件中配置
@@ -77,21 +86,26 @@ class Settings(BaseSettings):
     INFLUXDB_BUCKET: str = "battery_data"
 
 
-    @property
+    # 以下派生配置在进程生命周期内不变，首次访问后缓存
+    @cached_property
     def DATABASE_URL(self) -> str:
         """主数据库连接 URL"""
-        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
+        return self.get_database_url(self.DB_NAME)
 
-    @property
+    @cached_property
     def DATABASE_URL_SYNC(self) -> str:
         """主数据库同步连接 URL (用于 Alembic 迁移)"""
-        return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
+        return build_database_url(
+            "pymysql", self.DB_USER, self.DB_PASSWORD, self.DB_HOST, self.DB_PORT, self.DB_NAME
+        )
 
     def get_database_url(self, db_name: str) -> str:
         """获取指定数据库的连接 URL"""
-        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{db_name}?charset=utf8mb4"
+        return build_database_url(
+            "aiomysql", self.DB_USER, self.DB_PASSWORD, self.DB_HOST, self.DB_PORT, db_name
+        )
 
-    @property
+    @cached_property
     def SHOW_DOCS(self) -> bool:
         """是否显示 API 文档"""
         return self.ENVIRONMENT in (Environment.DEVELOPMENT, Environment.STAGING)
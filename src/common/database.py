@@ -2,6 +2,7 @@
 数据库连接管理
 支持多数据库连接和异步操作
 """
+from functools import cache
 from typing import AsyncGenerator
 
 from sqlalchemy import MetaData
@@ -56,9 +57,15 @@ class DatabaseManager:
                 echo=settings.DB_ECHO,
                 pool_size=settings.DB_POOL_SIZE,
                 max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,    # 池耗尽时最多等待的秒数，超时抛错而不是无限排队
                 pool_recycle=settings.DB_POOL_RECYCLE,
-                pool_pre_ping=True,           # 使用前检查连接（防止使用断开的连接）
+                # 默认关闭，省去每次借出时的 ping 往返；断线（MySQL 2006/2013/2055 等）由方言识别，
+                # SQLAlchemy 会失效该连接及更早建立的连接，死锁、锁等待超时等错误不影响连接
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+                pool_reset_on_return="rollback",          # 归还时回滚，清理未结束的事务
                 pool_use_lifo=True,           # 后进先出（优先使用最近的连接）
+                echo_pool=False,
+                query_cache_size=5000,        # 编译语句缓存（默认 500），容纳 FastCRUD 动态过滤条件生成的语句
             )
 
         return self._engines[key]
@@ -84,18 +91,27 @@ class DatabaseManager:
 
         return self._session_factories[key]
 
-    async def get_session(self, db_name: str | None = None) -> AsyncGenerator[AsyncSession, None]:
+    async def get_session(
+        self,
+        db_name: str | None = None,
+        readonly: bool = False,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         获取数据库会话（异步生成器）
         
         Args:
             db_name: 数据库名称，None 表示使用默认数据库
+            readonly: 只读会话，结束时回滚而不提交，省去一次 COMMIT 往返
         """
         session_factory = self.get_session_factory(db_name)
         async with session_factory() as session:
+            session.info["readonly"] = readonly
             try:
                 yield session
-                await session.commit()
+                if readonly:
+                    await session.rollback()
+                else:
+                    await session.commit()
             except Exception:
                 await session.rollback()
                 raise
@@ -121,11 +137,22 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# 默认数据库只读会话依赖（GET 等不写入的接口使用）
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """获取默认数据库的只读会话（结束时不提交）"""
+    async for session in db_manager.get_session(readonly=True):
+        yield session
+
+
 # 多数据库会话依赖工厂
+@cache
 def get_db_dependency(db_name: str):
     """
     创建指定数据库的会话依赖
     
+    按数据库名缓存：同一数据库始终返回同一个依赖函数，
+    FastAPI 才能在同一请求内复用会话（依赖缓存以函数对象为键）
+    
     使用示例:
         @router.get("/users")
         async def get_users(db: AsyncSession = Depends(get_db_dependency("myems_user_db"))):
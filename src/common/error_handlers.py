@@ -29,6 +29,13 @@ VALIDATION_ERROR_MESSAGES = {
 }
 
 
+class _ErrorContext(dict):
+    """format_map 使用的上下文：缺失的占位符原样保留"""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
 def get_chinese_error_message(error: dict) -> str:
     """
     将 Pydantic 验证错误转换为中文错误消息
@@ -40,25 +47,14 @@ def get_chinese_error_message(error: dict) -> str:
         中文错误消息
     """
     error_type = error.get("type", "")
-    ctx = error.get("ctx", {})
     field = error.get("loc", ["unknown"])[-1]  # 获取字段名
     
-    # 获取基础错误消息
-    base_message = VALIDATION_ERROR_MESSAGES.get(error_type, error.get("msg", "参数错误"))
-    
-    # 替换占位符
-    if "{ge}" in base_message and "ge" in ctx:
-        base_message = base_message.replace("{ge}", str(ctx["ge"]))
-    if "{gt}" in base_message and "gt" in ctx:
-        base_message = base_message.replace("{gt}", str(ctx["gt"]))
-    if "{le}" in base_message and "le" in ctx:
-        base_message = base_message.replace("{le}", str(ctx["le"]))
-    if "{lt}" in base_message and "lt" in ctx:
-        base_message = base_message.replace("{lt}", str(ctx["lt"]))
-    if "{min_length}" in base_message and "min_length" in ctx:
-        base_message = base_message.replace("{min_length}", str(ctx["min_length"]))
-    if "{max_length}" in base_message and "max_length" in ctx:
-        base_message = base_message.replace("{max_length}", str(ctx["max_length"]))
+    # 获取基础错误消息，模板占位符一次 format_map 完成替换
+    template = VALIDATION_ERROR_MESSAGES.get(error_type)
+    if template is None:
+        base_message = error.get("msg", "参数错误")
+    else:
+        base_message = template.format_map(_ErrorContext(error.get("ctx") or {}))
     
     return f"字段 '{field}': {base_message}"
 
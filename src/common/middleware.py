@@ -97,6 +97,10 @@ def setup_sql_logging(engine: Engine):
         """在执行 SQL 之后记录"""
         total_time = time.time() - conn.info["query_start_time"].pop(-1)
         
+        # SQL 日志未启用时跳过语句清理
+        if not sql_logger.is_enabled():
+            return
+
         # 只记录耗时的查询或特定的查询
         execution_time_ms = total_time * 1000
         
@@ -1,23 +1,25 @@
 """
 分页工具模块
 """
-import math
+from functools import cached_property
 from typing import TypeVar
 
 from fastapi import Query
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.common.schemas import PageInfo
 
 
 class PaginationParams(BaseModel):
     """分页参数"""
+    model_config = ConfigDict(frozen=True)  # 不可变，保证缓存的 offset 始终有效
+
     page: int = 1
     page_size: int = 10
 
-    @property
+    @cached_property
     def offset(self) -> int:
-        """计算偏移量，用于数据库查询"""
+        """计算偏移量，用于数据库查询（首次访问后缓存）"""
         return (self.page - 1) * self.page_size
 
 
@@ -52,7 +54,8 @@ def calculate_page_info(total: int, page: int, page_size: int) -> PageInfo:
     Returns:
         PageInfo: 分页信息对象
     """
-    total_pages = math.ceil(total / page_size) if page_size > 0 else 0
+    # 整数向上取整，避免浮点除法在大数值下丢失精度
+    total_pages = -(-total // page_size) if page_size > 0 else 0
     return PageInfo(
         page=page,
         page_size=page_size,
@@ -0,0 +1,49 @@
+"""
+全局响应类
+使用 orjson 直接序列化路由返回的字典，跳过 jsonable_encoder + json.dumps
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.common.schemas import format_datetime
+
+
+def orjson_default(value: Any) -> Any:
+    """
+    orjson 无法直接处理的类型的序列化函数
+
+    - datetime：与 FormattedDateTime 保持一致的格式
+    - date / time：ISO 格式
+    - Decimal：转为 float
+    - Pydantic 模型：由模型自身的序列化器一次性转为 JSON 兼容对象（可直接把已校验的请求体放进响应）
+    """
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.__pydantic_serializer__.to_python(value, mode="json")
+    raise TypeError(f"无法序列化类型 {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    基于 orjson 的 JSON 响应
+
+    datetime 交给 orjson_default 处理，保证直接返回数据库行字典时
+    输出格式与 Pydantic 响应模型一致
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
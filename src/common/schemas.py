@@ -3,16 +3,36 @@
 提供通用的请求/响应模型
 """
 from datetime import datetime
-from typing import Any, Generic, TypeVar
+from typing import Annotated, Any, Generic, TypeVar
 
-from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict, PlainSerializer
+
+
+def format_datetime(value: datetime) -> str:
+    """序列化 datetime 为易读的标准格式"""
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def set_fields_dict(model: BaseModel) -> dict[str, Any]:
+    """
+    取出模型中显式设置的字段，等价于 model_dump(exclude_unset=True)
+
+    直接读取 __dict__，不经过 Pydantic 序列化器；仅适用于没有嵌套模型、
+    别名和自定义序列化器的扁平模型（如 Create / Update Schema）
+    """
+    fields_set = model.model_fields_set
+    return {k: v for k, v in model.__dict__.items() if k in fields_set}
+
+
+# 统一格式的日期时间类型
+# 序列化器只绑定在声明为该类型的字段上，其他字段走 Pydantic 默认序列化
+FormattedDateTime = Annotated[datetime, PlainSerializer(format_datetime, return_type=str)]
 
 
 class CustomModel(BaseModel):
     """
     自定义基础模型
-    - 统一日期时间格式
+    - 日期时间字段请声明为 FormattedDateTime 以统一格式
     - 提供序列化方法
     """
     model_config = ConfigDict(
@@ -20,17 +40,9 @@ class CustomModel(BaseModel):
         populate_by_name=True,
     )
 
-    @field_serializer("*", mode="wrap")
-    def serialize_datetime(self, value: Any, serializer, info):
-        """统一序列化 datetime 字段为易读的标准格式"""
-        if isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d %H:%M:%S")
-        return serializer(value)
-
     def serializable_dict(self, **kwargs) -> dict[str, Any]:
-        """返回可序列化的字典"""
-        default_dict = self.model_dump(**kwargs)
-        return jsonable_encoder(default_dict)
+        """返回可序列化的字典（JSON 模式一次转换完成）"""
+        return self.model_dump(mode="json", **kwargs)
 
 
 # 泛型类型变量
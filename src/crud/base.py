@@ -2,13 +2,19 @@
 基础 CRUD 类
 封装 FastCRUD，提供类型安全的 CRUD 操作
 """
-from typing import Any, Generic, Type, TypeVar
+from functools import cache
+from itertools import islice
+from typing import Any, Generic, Iterable, Type, TypeVar
 
 from fastcrud import FastCRUD
 from pydantic import BaseModel
+from sqlalchemy import UniqueConstraint, bindparam, delete, insert, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.database import Base
+from src.common.schemas import set_fields_dict
 
 
 # 类型变量
@@ -16,6 +22,27 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# 批量插入行数达到该值且驱动为 asyncpg 时，使用 PostgreSQL COPY 协议写入
+COPY_THRESHOLD = 500
+
+# create_many 分块大小：输入流式消费，每块单独转换和写入
+CREATE_CHUNK_SIZE = 10_000
+
+# 按主键 IN 回查时每条语句的最大 ID 数
+IN_CHUNK_SIZE = 1000
+
+
+def _normalize_filters(filters: dict[str, Any]) -> dict[str, Any]:
+    """
+    按键名排序查询条件
+    
+    FastCRUD 按参数顺序生成 WHERE 子句，顺序不同的等价条件会占用不同的语句缓存项；
+    排序后同一组条件总是命中同一个缓存项
+    """
+    if len(filters) < 2:
+        return filters
+    return dict(sorted(filters.items()))
+
 
 class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -43,6 +70,39 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
         self._crud = FastCRUD(model)
 
+        # 列名只解析一次，避免逐行访问 __table__.columns
+        self._col_names = tuple(c.name for c in model.__table__.columns)
+
+        # 主键及唯一约束 / 唯一索引的列集合，用于判断查询条件能否作为 ON CONFLICT 目标
+        self._unique_keys = {frozenset(c.name for c in model.__table__.primary_key.columns)}
+        self._unique_keys.update(
+            frozenset(c.name for c in constraint.columns)
+            for constraint in model.__table__.constraints
+            if isinstance(constraint, UniqueConstraint)
+        )
+        self._unique_keys.update(
+            frozenset(c.name for c in index.columns)
+            for index in model.__table__.indexes
+            if index.unique
+        )
+        self._unique_keys.update(
+            frozenset((c.name,)) for c in model.__table__.columns if c.unique
+        )
+
+        # 常用语句在初始化时构建一次，调用时只绑定参数，编译结果由 SQLAlchemy 语句缓存复用
+        self._insert_returning = insert(model).returning(*model.__table__.columns)
+        self._select_by_ids = (
+            select(model).where(model.id.in_(bindparam("ids", expanding=True)))
+            if "id" in model.__table__.c
+            else None
+        )
+
+        # COPY 路径要求单一主键 id，且没有只能由数据库生成的 server_default
+        table = model.__table__
+        self._copy_supported = [c.name for c in table.primary_key.columns] == ["id"] and all(
+            c.server_default is None for c in table.columns if not c.primary_key
+        )
+
     async def get(
         self,
         db: AsyncSession,
@@ -66,7 +126,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db=db,
             schema_to_select=schema_to_select,
             return_as_model=return_as_model,
-            **kwargs,
+            **_normalize_filters(kwargs),
         )
 
     async def get_multi(
@@ -98,7 +158,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             limit=limit,
             schema_to_select=schema_to_select,
             return_as_model=return_as_model,
-            **kwargs,
+            **_normalize_filters(kwargs),
         )
 
     async def create(
@@ -122,66 +182,93 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self,
         db: AsyncSession,
         object: CreateSchemaType | dict[str, Any],
-        **search_kwargs: Any,
     ) -> dict[str, Any] | None:
         """
         创建记录并返回完整的记录数据（包含自增 ID）
         
+        - 支持 INSERT ... RETURNING（PostgreSQL、SQLite、MariaDB）：一次往返直接返回完整记录
+        - 其他（MySQL）：插入后按自增主键再查询一次
+        
         Args:
             db: 数据库会话
             object: 创建数据（Pydantic 模型或字典）
-            **search_kwargs: 用于查询新创建记录的条件（如果 create 返回 None）
         
         Returns:
             创建的完整记录（字典格式）
         """
-        # 先尝试创建并获取返回的对象
-        result = await self._crud.create(db=db, object=object)
-        
-        # 如果 FastCRUD 返回了对象，直接返回
-        if result is not None:
-            # 如果是 ORM 对象，需要刷新以获取自增 ID
-            if hasattr(result, '__dict__') and hasattr(result, 'id'):
-                # 重新查询以获取完整的数据（包括所有字段的默认值）
-                return await self.get(db=db, id=result.id)
-        
-        # 如果创建返回了 None 或不完整，根据提供的搜索条件查询
-        if search_kwargs:
-            return await self.get(db=db, **search_kwargs)
-        
-        return None
+        data = object if isinstance(object, dict) else set_fields_dict(object)
+
+        if db.get_bind().dialect.insert_returning:
+            result = await db.execute(self._insert_returning.values(**data))
+            return dict(result.mappings().one())
+
+        # 不支持 RETURNING：使用驱动返回的自增主键查询新记录
+        result = await db.execute(insert(self.model).values(**data))
+        return await self.get(db=db, id=result.inserted_primary_key[0])
 
     async def create_many(
         self,
         db: AsyncSession,
-        objects: list[CreateSchemaType | dict[str, Any]],
+        objects: Iterable[CreateSchemaType | dict[str, Any]],
     ) -> list[dict[str, Any]]:
         """
         批量创建记录（优化版，毫秒级性能）
         
-        使用 SQLAlchemy 原生的批量插入，比逐条插入快 100+ 倍
+        输入按 CREATE_CHUNK_SIZE 分块流式转换和写入，中间数据只保留当前块
+        
+        - PostgreSQL (asyncpg) 且行数 >= COPY_THRESHOLD：使用 COPY 协议写入
+        - 支持 INSERT ... RETURNING（PostgreSQL、SQLite、MariaDB）：一条批量插入语句直接返回完整记录
+        - 其他（MySQL）：插入后再批量查询一次
         
         Args:
             db: 数据库会话
-            objects: 要创建的对象列表（Pydantic 模型或字典）
+            objects: 要创建的对象（Pydantic 模型或字典），可以是任意可迭代对象
         
         Returns:
             创建的记录列表（包含自增 ID 和默认值）
         """
-        if not objects:
-            return []
+        # 将 Pydantic 模型转换为字典（惰性，逐块消费；直接读取已设置字段，跳过序列化器）
+        objects_data = (
+            obj if isinstance(obj, dict) else set_fields_dict(obj)
+            for obj in objects
+        )
+
+        created: list[dict[str, Any]] = []
+        while chunk := list(islice(objects_data, CREATE_CHUNK_SIZE)):
+            created.extend(await self._create_chunk(db, chunk))
+        return created
+
+    async def _create_chunk(
+        self,
+        db: AsyncSession,
+        objects_data: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        写入一个数据块并返回完整记录
         
-        # 将 Pydantic 模型转换为字典
-        objects_data = []
-        for obj in objects:
-            if isinstance(obj, dict):
-                objects_data.append(obj)
-            else:
-                # Pydantic 模型转字典
-                objects_data.append(obj.model_dump(exclude_unset=True))
+        Args:
+            db: 数据库会话
+            objects_data: 要创建的数据字典列表
         
-        # 使用 SQLAlchemy 的 add_all() 方法批量插入
-        # 这是最快的方式，一次性提交所有数据
+        Returns:
+            创建的记录列表
+        """
+        dialect = db.get_bind().dialect
+
+        # 大批量 + asyncpg：COPY 协议只做一次权限/类型检查，吞吐远高于多行 INSERT
+        if (
+            len(objects_data) >= COPY_THRESHOLD
+            and dialect.driver == "asyncpg"
+            and self._copy_supported
+        ):
+            return await self._copy_many(db, objects_data)
+
+        # 支持 RETURNING：一次往返完成插入并取回自增 ID 和默认值
+        if dialect.insert_executemany_returning:
+            result = await db.execute(self._insert_returning, objects_data)
+            return [dict(row) for row in result.mappings()]
+
+        # 不支持 RETURNING：使用 add_all() 批量插入后再查询
         instances = [self.model(**data) for data in objects_data]
         db.add_all(instances)
         await db.flush()  # 刷新以获取自增 ID
@@ -190,24 +277,96 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         ids = [instance.id for instance in instances]
         
         # 批量查询所有新插入的记录，获取完整数据（包括时间戳等）
-        from sqlalchemy import select
-        
-        query = select(self.model).where(self.model.id.in_(ids))
-        result = await db.execute(query)
-        created_instances = result.scalars().all()
-        
-        # 转换为字典列表
-        return [
-            {
-                "id": instance.id,
-                **(
-                    {col.name: getattr(instance, col.name) for col in instance.__table__.columns}
-                    if hasattr(instance, '__table__')
-                    else {}
-                ),
-            }
-            for instance in created_instances
-        ]
+        # IN 列表按 IN_CHUNK_SIZE 分段，避免超长 IN 拖慢查询规划
+        created_instances = []
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await db.execute(
+                self._select_by_ids, {"ids": ids[start:start + IN_CHUNK_SIZE]}
+            )
+            created_instances.extend(result.scalars().all())
+        
+        # 转换为字典列表：回查后的列值已载入实例 __dict__，直接读取以绕过属性描述符，
+        # 个别未载入的列（如 deferred）再走 getattr
+        col_names = self._col_names
+        rows = []
+        for instance in created_instances:
+            loaded = instance.__dict__
+            rows.append({
+                name: loaded[name] if name in loaded else getattr(instance, name)
+                for name in col_names
+            })
+
+        # 已转换为字典，移出会话以免 ORM 实例随批次累积
+        for instance in instances:
+            db.expunge(instance)
+        return rows
+
+    async def _copy_many(
+        self,
+        db: AsyncSession,
+        objects_data: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        使用 COPY 协议批量写入（仅 PostgreSQL + asyncpg）
+        
+        主键通过序列预先分配，列默认值在写入前补齐，因此无需回查即可返回完整记录
+        
+        Args:
+            db: 数据库会话
+            objects_data: 要创建的数据字典列表
+        
+        Returns:
+            创建的记录列表
+        """
+        table = self.model.__table__
+        columns = list(table.columns)
+        names = self._col_names
+
+        # 1. 预分配主键（经由会话执行，确保 COPY 与其处于同一事务）
+        ids = (
+            await db.execute(
+                text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :n)"),
+                {"table": table.fullname, "n": len(objects_data)},
+            )
+        ).scalars().all()
+
+        # 2. 列默认值：SQL 表达式（如 now()）一次查询求值，Python 可调用对象逐行求值
+        static_defaults: dict[str, Any] = {}
+        callable_defaults: dict[str, Any] = {}
+        clause_columns = []
+        for column in columns:
+            default = column.default
+            if default is None or column.primary_key:
+                continue
+            if default.is_scalar:
+                static_defaults[column.name] = default.arg
+            elif default.is_callable:
+                callable_defaults[column.name] = default.arg
+            elif default.is_clause_element:
+                clause_columns.append(column)
+        if clause_columns:
+            result = await db.execute(
+                select(*[c.default.arg.label(c.name) for c in clause_columns])
+            )
+            static_defaults.update(result.mappings().one())
+
+        rows = []
+        for pk, data in zip(ids, objects_data, strict=True):
+            row = {**static_defaults, **{k: fn(None) for k, fn in callable_defaults.items()}}
+            row.update(data)
+            row["id"] = pk
+            rows.append({name: row.get(name) for name in names})
+
+        # 3. COPY 写入
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=names,
+            records=[tuple(row[name] for name in names) for row in rows],
+        )
+        return rows
 
     async def update(
         self,
@@ -225,6 +384,57 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         await self._crud.update(db=db, object=object, **kwargs)
 
+    async def update_and_get(
+        self,
+        db: AsyncSession,
+        id: Any,
+        object: UpdateSchemaType | dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """
+        按主键更新记录并返回更新后的完整记录
+        
+        - 支持 UPDATE ... RETURNING（PostgreSQL、SQLite）：一次往返完成更新和读取
+        - 其他（MySQL）：根据影响行数判断是否存在，存在时再查询一次
+        
+        Args:
+            db: 数据库会话
+            id: 主键值
+            object: 更新数据（Pydantic 模型或字典），为空时仅查询
+        
+        Returns:
+            更新后的记录（字典格式），记录不存在时返回 None
+        """
+        data = object if isinstance(object, dict) else set_fields_dict(object)
+        if not data:
+            return await self.get(db=db, id=id)
+
+        stmt = update(self.model).where(self.model.id == id).values(**data)
+
+        if db.get_bind().dialect.update_returning:
+            result = await db.execute(stmt.returning(*self.model.__table__.columns))
+            row = result.mappings().first()
+            return dict(row) if row is not None else None
+
+        # MySQL 的 rowcount 为匹配行数（FOUND_ROWS），值未变化时也不为 0
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            return None
+        return await self.get(db=db, id=id)
+
+    async def delete_by_id(self, db: AsyncSession, id: Any) -> bool:
+        """
+        按主键删除记录（单条 DELETE，无需预先查询）
+        
+        Args:
+            db: 数据库会话
+            id: 主键值
+        
+        Returns:
+            是否删除了记录
+        """
+        result = await db.execute(delete(self.model).where(self.model.id == id))
+        return result.rowcount > 0
+
     async def delete(
         self,
         db: AsyncSession,
@@ -259,7 +469,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             记录数量
         """
-        return await self._crud.count(db=db, **kwargs)
+        return await self._crud.count(db=db, **_normalize_filters(kwargs))
 
     async def exists(
         self,
@@ -276,29 +486,64 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             是否存在
         """
-        return await self._crud.exists(db=db, **kwargs)
+        return await self._crud.exists(db=db, **_normalize_filters(kwargs))
+
+    def _can_upsert(self, db: AsyncSession, keys: Iterable[str]) -> bool:
+        """
+        是否可以使用 INSERT ... ON CONFLICT 单语句完成
+        
+        要求数据库为 PostgreSQL / SQLite（支持 ON CONFLICT 和 RETURNING），
+        且查询条件恰好对应一个主键或唯一约束
+        """
+        return (
+            db.get_bind().dialect.name in ("postgresql", "sqlite")
+            and frozenset(keys) in self._unique_keys
+        )
 
     async def get_or_create(
         self,
         db: AsyncSession,
         object: CreateSchemaType | dict[str, Any],
         **kwargs: Any,
-    ) -> tuple[ModelType, bool]:
+    ) -> tuple[dict[str, Any] | None, bool]:
         """
         获取或创建记录
         
+        - PostgreSQL / SQLite 且查询条件为唯一键：INSERT ... ON CONFLICT DO NOTHING RETURNING，
+          新建时一次往返，且不存在并发重复插入的竞态
+        - 其他：先查询，不存在时再创建
+        
         Args:
             db: 数据库会话
             object: 创建数据
             **kwargs: 查询条件
         
         Returns:
-            (模型实例, 是否新创建)
+            (记录字典, 是否新创建)
         """
+        # 查询条件同时作为新记录的字段值
+        data = {**(object if isinstance(object, dict) else set_fields_dict(object)), **kwargs}
+
+        if self._can_upsert(db, kwargs):
+            stmt = (
+                sqlite_insert(self.model)
+                if db.get_bind().dialect.name == "sqlite"
+                else pg_insert(self.model)
+            )
+            stmt = (
+                stmt.values(**data)
+                .on_conflict_do_nothing(index_elements=list(kwargs))
+                .returning(*self.model.__table__.columns)
+            )
+            row = (await db.execute(stmt)).mappings().first()
+            if row is not None:
+                return dict(row), True
+            return await self.get(db=db, **kwargs), False
+
         existing = await self.get(db=db, **kwargs)
         if existing:
             return existing, False
-        created = await self.create(db=db, object=object)
+        created = await self.create_and_get(db=db, object=data)
         return created, True
 
     async def update_or_create(
@@ -306,23 +551,48 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db: AsyncSession,
         object: CreateSchemaType | UpdateSchemaType | dict[str, Any],
         **kwargs: Any,
-    ) -> tuple[ModelType, bool]:
+    ) -> tuple[dict[str, Any] | None, bool]:
         """
         更新或创建记录
         
+        - PostgreSQL 且查询条件为唯一键：INSERT ... ON CONFLICT DO UPDATE RETURNING，
+          一次往返，是否新建由 xmax = 0 判断
+        - 其他：先查询，再更新或创建
+        
         Args:
             db: 数据库会话
             object: 创建/更新数据
             **kwargs: 查询条件
         
         Returns:
-            (模型实例, 是否新创建)
+            (记录字典, 是否新创建)
         """
+        data = object if isinstance(object, dict) else set_fields_dict(object)
+
+        if data and db.get_bind().dialect.name == "postgresql" and self._can_upsert(db, kwargs):
+            stmt = pg_insert(self.model).values(**{**data, **kwargs})
+            set_ = {name: stmt.excluded[name] for name in data}
+            # ON CONFLICT 的 SET 子句不会自动应用列的 onupdate（如 updated_at）
+            for column in self.model.__table__.columns:
+                onupdate = column.onupdate
+                if onupdate is not None and onupdate.is_clause_element and column.name not in set_:
+                    set_[column.name] = onupdate.arg
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(kwargs),
+                set_=set_,
+            ).returning(
+                *self.model.__table__.columns,
+                (literal_column("xmax") == 0).label("_created"),
+            )
+            row = dict((await db.execute(stmt)).mappings().one())
+            created = row.pop("_created")
+            return row, created
+
         existing = await self.get(db=db, **kwargs)
         if existing:
             await self.update(db=db, object=object, **kwargs)
             return await self.get(db=db, **kwargs), False
-        created = await self.create(db=db, object=object)
+        created = await self.create_and_get(db=db, object={**data, **kwargs})
         return created, True
 
 
@@ -337,9 +607,10 @@ class CRUDFactory:
     """
 
     @staticmethod
+    @cache
     def create(model: Type[ModelType]) -> BaseCRUD[ModelType, BaseModel, BaseModel]:
         """
-        创建 CRUD 实例
+        创建 CRUD 实例（按模型类缓存，同一模型始终返回同一实例）
         
         Args:
             model: SQLAlchemy 模型类
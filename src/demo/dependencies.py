@@ -2,18 +2,22 @@
 Demo 模块 - 依赖项
 演示如何定义和使用依赖项
 """
+import asyncio
 from typing import Any
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.common.database import get_db
+from src.common.database import get_db_readonly
 from src.demo import service
+from src.demo.schemas import BatchItemRequest, ItemCreate
 
 
 async def valid_item_id(
     item_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ) -> dict[str, Any]:
     """
     验证 Item ID 是否存在
@@ -29,5 +33,30 @@ async def valid_item_id(
     return await service.get_item_by_id(db, item_id)
 
 
+# 请求体超过该字节数时，在线程池中解析和校验，避免长时间阻塞事件循环
+BATCH_OFFLOAD_BYTES = 64 * 1024
+
+
+async def parse_batch_items(request: Request) -> list[ItemCreate]:
+    """
+    解析并校验批量创建请求体
     
+    大批量（上万条）数据的 Pydantic 校验是纯 CPU 计算，
+    请求体较大时放到线程池执行，事件循环可以继续处理其他请求
+    
+    Raises:
+        RequestValidationError: 请求体校验失败（与 FastAPI 自动校验的错误格式一致）
+    """
+    body = await request.body()
+    try:
+        if len(body) > BATCH_OFFLOAD_BYTES:
+            batch = await asyncio.to_thread(BatchItemRequest.model_validate_json, body)
+        else:
+            batch = BatchItemRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+            body=body,
+        ) from e
+    return batch.items
 
@@ -2,7 +2,7 @@
 Demo 模块 - 数据库模型
 演示如何定义 SQLAlchemy 模型
 """
-from sqlalchemy import Boolean, String, Text
+from sqlalchemy import Boolean, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.common.models import BaseModel
@@ -41,4 +41,13 @@ class Item(BaseModel):
         nullable=True,
         comment="分类",
     )
+    # 逻辑外键：不建数据库外键约束，demo 模块不依赖 users 表
+    # 已有数据库需先执行 sql/migrations/2026-10-15_demo_item_add_user_id.sql
+    user_id: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        default=None,
+        index=True,
+        comment="所属用户ID（关联 users.id）",
+    )
 
@@ -9,12 +9,12 @@ from fastapi import APIRouter, Depends, Query, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.common.database import get_db
-from src.demo.dependencies import valid_item_id
+from src.common.database import get_db, get_db_readonly
+from src.demo.dependencies import parse_batch_items, valid_item_id
 from src.demo.service import (
     create_item as create_item_service,
     create_items_batch,
-    create_items_batch_background,
+    dispatch_items_batch_background,
     delete_item as delete_item_service,
     get_item_by_id,
     get_items,
@@ -28,11 +28,26 @@ from src.demo.schemas import (
     ItemUpdate,
 )
 from src.common.pagination import PaginationParams, get_pagination
+from src.common.responses import ORJSONResponse
 from src.common.schemas import MessageResponse
 
 
 router = APIRouter(prefix="/items", tags=["Demo - Items"])
 
+# 参数化的响应模型在模块加载时创建一次，路由中直接复用
+MessageStrResponse = MessageResponse[str]
+
+# 持有后台任务的引用，防止任务在完成前被垃圾回收
+_background_tasks: set[asyncio.Task] = set()
+
+# ItemResponse 的字段集合：行字典按此投影后再序列化，表中新增的列不会出现在响应中
+_ITEM_RESPONSE_FIELDS = tuple(ItemResponse.model_fields)
+
+
+def _item_payload(row: dict[str, Any]) -> dict[str, Any]:
+    """数据库行字典 -> ItemResponse 字段对应的字典"""
+    return {field: row[field] for field in _ITEM_RESPONSE_FIELDS}
+
 
 @router.get(
     "",
@@ -41,11 +56,11 @@ router = APIRouter(prefix="/items", tags=["Demo - Items"])
     description="获取 Item 列表，支持分页和过滤",
 )
 async def list_items(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     pagination: PaginationParams = Depends(get_pagination),
     is_active: bool | None = Query(None, description="是否激活"),
     category: str | None = Query(None, description="分类"),
-) -> ItemListResponse:
+) -> ORJSONResponse:
     """获取 Item 列表"""
     result = await get_items(
         db=db,
@@ -55,13 +70,11 @@ async def list_items(
         category=category,
     )
     
-    # Pydantic 会自动将 datetime 对象序列化为字符串
-    items_list = [ItemResponse(**item) for item in result.get("data", [])]
-    
-    return ItemListResponse(
-        data=items_list,
-        total=result.get("total_count", 0),
-    )
+    # 数据库行字典按 ItemResponse 字段投影后直接序列化，无需逐条构造模型
+    return ORJSONResponse({
+        "data": [_item_payload(row) for row in result.get("data", [])],
+        "total": result.get("total_count", 0),
+    })
 
 
 @router.get(
@@ -72,9 +85,10 @@ async def list_items(
 )
 async def get_item(
     item: dict[str, Any] = Depends(valid_item_id),
-) -> ItemResponse:
+) -> ORJSONResponse:
     """获取单个 Item"""
-    return ItemResponse(**item)
+    # 行字典按 ItemResponse 字段投影，response_model 仅用于生成 OpenAPI 文档
+    return ORJSONResponse(_item_payload(item))
 
 
 @router.post(
@@ -87,11 +101,11 @@ async def get_item(
 async def create_item(
     item_data: ItemCreate,
     db: AsyncSession = Depends(get_db),
-) -> ItemResponse:
+) -> ORJSONResponse:
     """创建 Item"""
     item = await create_item_service(db=db, item_data=item_data)
-    # create_item_service 返回的已经是字典，包含自增 ID
-    return ItemResponse(**item)
+    # create_item_service 返回的已经是字典，包含自增 ID，投影后直接序列化
+    return ORJSONResponse(_item_payload(item), status_code=status.HTTP_201_CREATED)
 
 
 @router.put(
@@ -104,15 +118,15 @@ async def update_item(
     item_id: int,
     item_data: ItemUpdate,
     db: AsyncSession = Depends(get_db),
-) -> ItemResponse:
+) -> ORJSONResponse:
     """更新 Item"""
     item = await update_item_service(db=db, item_id=item_id, item_data=item_data)
-    return ItemResponse(**item)
+    return ORJSONResponse(_item_payload(item))
 
 
 @router.delete(
     "/{item_id}",
-    response_model=MessageResponse,
+    response_model=MessageStrResponse,
     status_code=status.HTTP_200_OK,
     summary="删除 Item",
     description="删除指定 ID 的 Item",
@@ -120,10 +134,10 @@ async def update_item(
 async def delete_item(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-) -> MessageResponse:
+) -> MessageStrResponse:
     """删除 Item"""
     await delete_item_service(db=db, item_id=item_id)
-    return MessageResponse(
+    return MessageStrResponse(
         code=200,
         message="success",
         data=f"Item {item_id} 已删除"
@@ -131,22 +145,32 @@ async def delete_item(
 
 @router.post(
     "/batch",
-    response_model=MessageResponse,
+    response_model=MessageStrResponse,
     status_code=status.HTTP_202_ACCEPTED,
     summary="批量创建 Item",
     description="批量创建多个 Item（后台异步，毫秒级响应）",
+    # 请求体由 parse_batch_items 手动解析，这里补充文档中的请求体结构
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": BatchItemRequest.model_json_schema(
+                ref_template="#/components/schemas/{model}",
+            )}},
+        },
+    },
 )
 async def batch_add_items(
-    request: BatchItemRequest,
+    items_data: list[ItemCreate] = Depends(parse_batch_items),
     db: AsyncSession = Depends(get_db),
-) -> MessageResponse:
-    items_data = request.items
+) -> MessageStrResponse:
     
-    # 创建后台任务，使用独立的数据库会话，不等待结果
-    asyncio.create_task(create_items_batch_background(items_data=items_data))
+    # 创建后台任务：分批并发写入，每个子批次使用独立的数据库会话，不等待结果
+    task = asyncio.create_task(dispatch_items_batch_background(items_data=items_data))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     
     # 立即返回成功消息
-    return MessageResponse(
+    return MessageStrResponse(
         code=202,
         message="success",
         data=f"已接受 {len(items_data)} 条数据，正在后台处理..."
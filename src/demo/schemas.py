@@ -2,11 +2,10 @@
 Demo 模块 - Pydantic 模型（Schema）
 演示请求和响应模型的定义
 """
-from datetime import datetime
 
 from pydantic import Field
 
-from src.common.schemas import CustomModel
+from src.common.schemas import CustomModel, FormattedDateTime
 
 
 class ItemBase(CustomModel):
@@ -35,8 +34,8 @@ class ItemUpdate(CustomModel):
 class ItemResponse(ItemBase):
     """Item 响应模型"""
     id: int = Field(..., description="项目ID")
-    created_at: datetime = Field(..., description="创建时间")
-    updated_at: datetime = Field(..., description="更新时间")
+    created_at: FormattedDateTime = Field(..., description="创建时间")
+    updated_at: FormattedDateTime = Field(..., description="更新时间")
 
 
 class ItemListResponse(CustomModel):
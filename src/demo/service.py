@@ -2,8 +2,10 @@
 Demo 模块 - 业务逻辑层
 演示如何组织业务逻辑
 """
+import asyncio
 from typing import Any
 
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud import BaseCRUD
@@ -11,6 +13,7 @@ from src.common.database import db_manager
 from src.demo.models import Item
 from src.demo.schemas import ItemCreate, ItemResponse, ItemUpdate
 from src.common.exceptions import NotFoundException
+from src.utils.cache import TTLCache
 
 
 class ItemCRUD(BaseCRUD[Item, ItemCreate, ItemUpdate]):
@@ -21,6 +24,30 @@ class ItemCRUD(BaseCRUD[Item, ItemCreate, ItemUpdate]):
 # CRUD 实例
 item_crud = ItemCRUD(Item)
 
+# 单条 Item 读取缓存（进程内，按 ID），本进程的更新/删除会使其失效；
+# 多进程部署或存在其他写入方时，最多读到 ttl 秒前的数据
+_item_cache = TTLCache(maxsize=1024, ttl=5)
+
+
+def _invalidate_item_cache(db: AsyncSession, item_id: int) -> None:
+    """
+    使单条 Item 缓存失效
+
+    写入前先移除一次；写入在 get_db 结束时才提交，提交前其他会话仍可能读到旧行并重新写入缓存，
+    因此在本会话提交后再移除一次
+    """
+    _item_cache.pop(item_id)
+    event.listen(
+        db.sync_session,
+        "after_commit",
+        lambda session: _item_cache.pop(item_id),
+        once=True,
+    )
+
+# 后台批量写入：每个子批次的行数、同时写入的子批次数（限制占用的数据库连接）
+BATCH_CHUNK_SIZE = 10_000
+BATCH_CONCURRENCY = 2
+
 
 async def get_item_by_id(db: AsyncSession, item_id: int) -> dict[str, Any]:
     """
@@ -36,10 +63,15 @@ async def get_item_by_id(db: AsyncSession, item_id: int) -> dict[str, Any]:
     Raises:
         NotFoundException: 当 Item 不存在时
     """
+    cached = _item_cache.get(item_id)
+    if cached is not None:
+        return dict(cached)
+
     item = await item_crud.get(db=db, id=item_id)
     if not item:
         raise NotFoundException(detail=f"Item {item_id} 不存在")
-    return item
+    _item_cache.set(item_id, item)
+    return dict(item)
 
 
 async def get_items(
@@ -62,18 +94,39 @@ async def get_items(
     Returns:
         包含 data 和 total_count 的字典
     """
-    filters = {}
+    conditions = []
     if is_active is not None:
-        filters["is_active"] = is_active
+        conditions.append(Item.is_active == is_active)
     if category is not None:
-        filters["category"] = category
+        conditions.append(Item.category == category)
 
-    return await item_crud.get_multi(
-        db=db,
-        offset=offset,
-        limit=limit,
-        **filters,
+    # 一条语句同时取分页数据和总数（窗口函数 COUNT(*) OVER ()）
+    stmt = (
+        select(*Item.__table__.c, func.count().over().label("total"))
+        .where(*conditions)
+        .order_by(Item.id)
+        .limit(limit)
+        .offset(offset)
     )
+    rows = (await db.execute(stmt)).mappings().all()
+
+    if rows:
+        total_count = rows[0]["total"]
+    elif offset:
+        # 偏移量超出范围时窗口函数没有行可返回，单独查询总数
+        total_count = await db.scalar(
+            select(func.count()).select_from(Item).where(*conditions)
+        )
+    else:
+        total_count = 0
+
+    data = []
+    for row in rows:
+        item = dict(row)
+        del item["total"]
+        data.append(item)
+
+    return {"data": data, "total_count": total_count}
 
 
 async def create_item(db: AsyncSession, item_data: ItemCreate) -> dict[str, Any]:
@@ -88,11 +141,9 @@ async def create_item(db: AsyncSession, item_data: ItemCreate) -> dict[str, Any]
         创建的 Item 数据字典（包含自增 ID）
     """
     # 使用 create_and_get 创建后立即返回完整的记录（包含自增 ID）
-    # 根据唯一字段 name 查询新创建的记录
     return await item_crud.create_and_get(
         db=db,
         object=item_data,
-        name=item_data.name,
     )
 
 
@@ -115,15 +166,12 @@ async def update_item(
     Raises:
         NotFoundException: 当 Item 不存在时
     """
-    # 先检查是否存在
-    await get_item_by_id(db, item_id)
-
-    # 过滤掉 None 值
-    update_data = item_data.model_dump(exclude_unset=True)
-    if update_data:
-        await item_crud.update(db=db, object=update_data, id=item_id)
-
-    return await get_item_by_id(db, item_id)
+    # 单条 UPDATE ... RETURNING，无需先查询是否存在
+    _invalidate_item_cache(db, item_id)
+    item = await item_crud.update_and_get(db=db, id=item_id, object=item_data)
+    if item is None:
+        raise NotFoundException(detail=f"Item {item_id} 不存在")
+    return item
 
 
 async def delete_item(db: AsyncSession, item_id: int) -> None:
@@ -137,9 +185,10 @@ async def delete_item(db: AsyncSession, item_id: int) -> None:
     Raises:
         NotFoundException: 当 Item 不存在时
     """
-    # 先检查是否存在
-    await get_item_by_id(db, item_id)
-    await item_crud.delete(db=db, id=item_id)
+    # 根据影响行数判断是否存在，无需先查询
+    _invalidate_item_cache(db, item_id)
+    if not await item_crud.delete_by_id(db=db, id=item_id):
+        raise NotFoundException(detail=f"Item {item_id} 不存在")
 
 
 async def create_items_batch(
@@ -186,3 +235,29 @@ async def create_items_batch_background(
         finally:
             await session.close()
 
+
+async def dispatch_items_batch_background(
+    items_data: list[ItemCreate],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> None:
+    """
+    后台分批并发创建 Item
+    
+    将数据切分为 chunk_size 大小的子批次，每个子批次使用独立会话写入，
+    通过信号量限制同时写入的子批次数，避免后台任务占满连接池影响前台请求
+    
+    Args:
+        items_data: 要创建的 Item 列表
+        chunk_size: 每个子批次的行数
+        concurrency: 最大并发子批次数
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(chunk: list[ItemCreate]) -> None:
+        async with semaphore:
+            await create_items_batch_background(items_data=chunk)
+
+    async with asyncio.TaskGroup() as tg:
+        for start in range(0, len(items_data), chunk_size):
+            tg.create_task(_run(items_data[start:start + chunk_size]))
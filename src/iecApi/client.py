@@ -1,9 +1,12 @@
-from typing import Dict, Any, Callable
+import logging
+from typing import Dict, Any, Callable, List, Optional
 try:
     from .model import IecServer
 except ImportError:
     from model import IecServer
 
+logger = logging.getLogger(__name__)
+
 class IecClient:
     """
     Client (MMS Client): 模拟主站系统/你的代码。
@@ -24,20 +27,22 @@ class IecClient:
         """
         MMS GetNameList: 获取模型结构
         """
-        print("\n[Client] Discovery (Browsing Model)...")
         if not self.connected_server:
-            print("Error: Not connected")
+            logger.warning("[Client] Discovery failed: Not connected")
             return
 
+        # 整棵模型树先拼成多行文本，一次输出
+        lines = ["[Client] Discovery (Browsing Model)..."]
         for ld_name, ld in self.connected_server.devices.items():
-            print(f"  +- LD: {ld_name}")
+            lines.append(f"  +- LD: {ld_name}")
             for ln_name, ln in ld.nodes.items():
-                print(f"     +- LN: {ln_name}")
+                lines.append(f"     +- LN: {ln_name}")
                 for do_name, do in ln.objects.items():
-                    print(f"        +- DO: {do_name}")
+                    lines.append(f"        +- DO: {do_name}")
                     for da_name, da in do.attributes.items():
-                        print(f"           - DA: {da_name} = {da.value}")
-        print("[Client] Discovery Complete.\n")
+                        lines.append(f"           - DA: {da_name} = {da.value}")
+        lines.append("[Client] Discovery Complete.")
+        logger.info("\n".join(lines))
 
     def read_value(self, path: str):
         """
@@ -72,14 +77,22 @@ class IecClient:
         except KeyError:
             print(f"[ClientResponse] Error: RCB not found")
 
-    def _on_report_received(self, rpt_id: str, data: Dict[str, Any], reason: str):
+    def _on_report_received(self, rpt_id: str, data: Dict[str, Any], reason: str,
+                            inclusion: Optional[List[bool]] = None):
         """
         回调函数: 当收到 Server 推送的报告时执行
         """
-        print(f"\n⚡⚡ [Client Event] REPORT RECEIVED ⚡⚡")
-        print(f"  Report ID: {rpt_id}")
-        print(f"  Reason: {reason}")
-        print(f"  Data Content:")
-        for path, val in data.items():
-            print(f"    {path} : {val}")
-        print(f"⚡⚡ [End Report] ⚡⚡\n")
+        # 整份报告拼成一条日志输出；INFO 未开启时不拼接
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        lines = [
+            "⚡⚡ [Client Event] REPORT RECEIVED ⚡⚡",
+            f"  Report ID: {rpt_id}",
+            f"  Reason: {reason}",
+        ]
+        if inclusion is not None:
+            lines.append("  Inclusion: " + "".join("1" if bit else "0" for bit in inclusion))
+        lines.append("  Data Content:")
+        lines.extend(f"    {path} : {val}" for path, val in data.items())
+        lines.append("⚡⚡ [End Report] ⚡⚡")
+        logger.info("\n".join(lines))
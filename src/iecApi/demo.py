@@ -1,3 +1,5 @@
+import logging
+import sys
 import time
 # 尝试相对导入 (当作为包运行 / python -m src.iecApi.demo 时)
 # 如果失败 (ImportError / 作为脚本直接运行 python demo.py)，则回退到绝对导入
@@ -40,7 +42,8 @@ def build_mock_server():
     
     # 基于该数据集创建一个报告控制块 (RCB: 快递单)
     # 名字: "urcb01", 报告ID: "MyIED/Protection/MMXU1$RP$urcb01"
-    ln_mmxu.create_report("urcb01", "dsMeas", "MyIED/Protection/MMXU1$RP$urcb01")
+    # 缓冲 100ms: 同一窗口内的多次变化合并为一份报告
+    ln_mmxu.create_report("urcb01", "dsMeas", "MyIED/Protection/MMXU1$RP$urcb01", buf_time_ms=100)
     
     return server, da_a # 返回 server 以及一个具体的属性对象(用于后续模拟修改值)
 
@@ -91,4 +94,6 @@ def run_demo():
     print("\n=== 演示结束 ===")
 
 if __name__ == "__main__":
+    # 演示中打开 DEBUG，输出数据变化、报告推送和模型浏览的详细过程
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
     run_demo()
@@ -1,5 +1,18 @@
+import asyncio
+import logging
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Callable, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Callable, Any, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
 
 # ==========================================
 # 1. 基础模型 (Data Model Base Classes)
@@ -9,66 +22,113 @@ class DataAttribute:
     """
     DA (Data Attribute): 树叶。实际的数据值。
     例如: mag.f (幅值.浮点数)
+
+    值与时间戳按列存放在所属服务端的扁平数组中 (SoA)，DA 只保存句柄，
+    读写 value / timestamp 即读写数组中对应的位置。
     """
+    __slots__ = ("name", "quality", "parent", "_server", "handle", "_full_path",
+                 "_values", "_timestamps", "_idx")
+
     def __init__(self, name: str, value: Any, parent=None):
-        self.name = name
-        self._value = value
-        self.timestamp = time.time()
+        # 同名属性在各个 DO 下大量重复，驻留后共享同一个字符串对象
+        self.name = sys.intern(name)
         self.quality = "good"
         self.parent = parent
-        self.trigger_callbacks: List[Callable] = []
+        # 所属服务端: 数据变化时从其订阅表中查找监听的报告控制块
+        self._server = parent.server if parent else None
+        # 父节点在构造时已确定，完整路径只计算一次
+        self._full_path = f"{parent.full_path}.{name}" if parent else name
+
+        server = self._server
+        if server is not None:
+            # 在服务端分配整数句柄，值和时间戳追加到服务端的列数组
+            self.handle = server._register(self, value)
+            self._values = server._values
+            self._timestamps = server._timestamps
+            self._idx = self.handle
+        else:
+            # 未挂到服务端的独立属性: 使用自己的单元素存储，句柄为 -1
+            self.handle = -1
+            self._values = [value]
+            self._timestamps = [time.time_ns()]
+            self._idx = 0
 
     @property
     def value(self):
-        return self._value
+        return self._values[self._idx]
 
     @value.setter
     def value(self, new_val):
         """
         核心机制: 当数据改变时，触发回调 (模拟 Report 机制)
         """
-        if self._value != new_val:
-            print(f"[IED Internal] Hardware Update: {self.get_full_path()} Changed {self._value} -> {new_val}")
-            self._value = new_val
-            self.timestamp = time.time()
+        values, idx = self._values, self._idx
+        old_val = values[idx]
+        if old_val != new_val:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[IED Internal] Hardware Update: %s Changed %s -> %s", self._full_path, old_val, new_val)
+            values[idx] = new_val
+            self._timestamps[idx] = time.time_ns()
             # 触发所有监听该数据的报告控制块
-            for callback in self.trigger_callbacks:
-                callback(self)
+            if self._server is not None:
+                for rcb in self._server._subscribers.get(id(self), ()):
+                    rcb.on_data_change(self)
+
+    @property
+    def timestamp(self) -> int:
+        """最近一次变化的时间 (Unix 纳秒整数)"""
+        return self._timestamps[self._idx]
 
-    def get_full_path(self) -> str:
-        if self.parent:
-            return f"{self.parent.get_full_path()}.{self.name}"
-        return self.name
+    @timestamp.setter
+    def timestamp(self, ts: int):
+        self._timestamps[self._idx] = ts
+
+    @property
+    def full_path(self) -> str:
+        return self._full_path
 
 class DataObject:
     """
     DO (Data Object): 逻辑节点下的对象。
     例如: PhV (相电压), Pos (开关位置)
     """
+    __slots__ = ("name", "parent", "attributes", "_full_path", "server")
+
     def __init__(self, name: str, parent=None):
-        self.name = name
+        self.name = sys.intern(name)
         self.parent = parent
         self.attributes: Dict[str, DataAttribute] = {}
+        # 与 DataAttribute 一致: 无父节点时作为独立对象，不挂到服务端
+        self._full_path = f"{parent.full_path}.{name}" if parent else name
+        self.server = parent.server if parent else None
 
     def add_da(self, name: str, value: Any) -> DataAttribute:
         da = DataAttribute(name, value, parent=self)
         self.attributes[name] = da
+        # 登记到服务端的路径索引，供按路径读取时 O(1) 查找
+        if self.server is not None:
+            self.server._path_index[da.full_path] = da
         return da
 
-    def get_full_path(self) -> str:
-        return f"{self.parent.get_full_path()}.{self.name}"
+    @property
+    def full_path(self) -> str:
+        return self._full_path
 
 class LogicalNode:
     """
     LN (Logical Node): 最小功能单元。
     例如: MMXU (测量), XCBR (断路器)
     """
+    __slots__ = ("name", "parent", "objects", "datasets", "reports", "_full_path", "server")
+
     def __init__(self, name: str, parent=None):
-        self.name = name
+        self.name = sys.intern(name)
         self.parent = parent
         self.objects: Dict[str, DataObject] = {}
         self.datasets: Dict[str, List[DataAttribute]] = {}
         self.reports: Dict[str, 'ReportControlBlock'] = {}
+        self._full_path = f"{parent.full_path}/{name}" if parent else name
+        self.server = parent.server if parent else None
 
     def add_do(self, name: str) -> DataObject:
         do = DataObject(name, parent=self)
@@ -80,26 +140,31 @@ class LogicalNode:
         self.datasets[name] = da_list
         print(f"[IED Config] Created DataSet: {name} with {len(da_list)} items")
 
-    def create_report(self, name: str, dataset_name: str, rpt_id: str):
-        """创建报告控制块 (快递单)"""
+    def create_report(self, name: str, dataset_name: str, rpt_id: str, buf_time_ms: int = 0):
+        """创建报告控制块 (快递单)，buf_time_ms 为报告缓冲时间 (0 表示立即发送)"""
         if dataset_name not in self.datasets:
             raise ValueError(f"DataSet {dataset_name} not found")
         
-        rcb = ReportControlBlock(name, rpt_id, self.datasets[dataset_name], parent=self)
+        rcb = ReportControlBlock(name, rpt_id, self.datasets[dataset_name], parent=self,
+                                  buf_time_ms=buf_time_ms)
         self.reports[name] = rcb
         return rcb
 
-    def get_full_path(self) -> str:
-        return f"{self.parent.get_full_path()}/{self.name}"
+    @property
+    def full_path(self) -> str:
+        return self._full_path
 
 class LogicalDevice:
     """
     LD (Logical Device): 虚拟装置，功能分区。
     例如: Protection, Measurement
     """
+    __slots__ = ("name", "parent", "server", "nodes")
+
     def __init__(self, name: str, parent=None):
-        self.name = name
+        self.name = sys.intern(name)
         self.parent = parent
+        self.server = parent  # 所属 IecServer
         self.nodes: Dict[str, LogicalNode] = {}
 
     def add_ln(self, name: str) -> LogicalNode:
@@ -107,38 +172,119 @@ class LogicalDevice:
         self.nodes[name] = ln
         return ln
     
-    def get_full_path(self) -> str:
-        return f"{self.name}" # LD作为根路径的一部分
+    @property
+    def full_path(self) -> str:
+        return self.name # LD作为根路径的一部分
 
 class IecServer:
     """
     SERVER: 物理设备本身。
     """
+    __slots__ = ("name", "devices", "_path_index", "_subscribers", "_handles",
+                 "_values", "_timestamps", "_names")
+
     def __init__(self, name: str):
         self.name = name
         self.devices: Dict[str, LogicalDevice] = {}
+        # 完整路径 -> DA 的扁平索引 (由 DataObject.add_da 维护)
+        self._path_index: Dict[str, DataAttribute] = {}
+        # id(DA) -> 监听该 DA 的报告控制块 (由 ReportControlBlock 注册)
+        self._subscribers: Dict[int, List['ReportControlBlock']] = {}
+        # 按句柄下标排列的列数组 (SoA): DA 对象、当前值、时间戳、完整路径
+        self._handles: List[DataAttribute] = []
+        self._values: List[Any] = []
+        self._timestamps: List[int] = []
+        self._names: List[str] = []
 
     def add_ld(self, name: str) -> LogicalDevice:
         ld = LogicalDevice(name, parent=self)
         self.devices[name] = ld
         return ld
 
+    def _register(self, da: DataAttribute, value: Any) -> int:
+        """登记新建的 DA，返回其句柄"""
+        handle = len(self._handles)
+        self._handles.append(da)
+        self._values.append(value)
+        self._timestamps.append(time.time_ns())
+        self._names.append(da.full_path)
+        return handle
+
+    def snapshot(self) -> Dict[str, Any]:
+        """全部数据属性的当前值快照 {完整路径: 值}，直接按列数组拼接，不遍历模型树"""
+        return dict(zip(self._names, self._values, strict=True))
+
+    def values_array(self) -> "np.ndarray":
+        """
+        全部数据属性的当前值 (float64 数组，下标即句柄)，供批量分析使用
+        仅适用于数值型属性，需要安装 numpy
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("values_array 需要安装 numpy")
+        return np.asarray(self._values, dtype=np.float64)
+
+    def bulk_update(self, handles, values) -> int:
+        """
+        批量更新数据值 (模拟一次采集周期内多个传感器同时刷新)
+        在一个循环内完成比较、打时间戳和报告分发，避免逐个经过属性 setter。
+
+        Args:
+            handles: DA 句柄序列 (DataAttribute.handle)
+            values: 与 handles 一一对应的新值
+
+        Returns:
+            实际发生变化的 DA 数量
+        """
+        das = self._handles
+        current = self._values
+        timestamps = self._timestamps
+        subscribers = self._subscribers
+        now = time.time_ns()
+        changed = 0
+        for handle, new_val in zip(handles, values, strict=True):
+            if current[handle] == new_val:
+                continue
+            current[handle] = new_val
+            timestamps[handle] = now
+            changed += 1
+            da = das[handle]
+            for rcb in subscribers.get(id(da), ()):
+                rcb.on_data_change(da)
+        if changed and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[IED Internal] Bulk Update: %d of %d attributes changed", changed, len(handles))
+        return changed
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _split_path(path: str) -> Tuple[str, str, str, str]:
+        """
+        Simple parser: Device/Node.Object.Attribute
+        解析结果按路径缓存 (轮询时客户端反复请求相同路径)
+        """
+        ld_name, rest = path.split('/', 1)
+        ln_name, rest = rest.split('.', 1)
+        do_name, da_name = rest.split('.', 1)
+        return ld_name, ln_name, do_name, da_name
+
     def get_attribute_by_path(self, path: str) -> Optional[DataAttribute]:
         """
         通过字符串路径查找属性
         Format: LD/LN.DO.DA (Simplification)
         Real MMS path is complex, this is conceptual.
         """
+        da = self._path_index.get(path)
+        if da is not None:
+            return da
+
+        # 冷路径: 索引中没有时按层级解析 (如绕过 add_da 直接添加的属性)
         try:
-            # Simple parser: Device/Node.Object.Attribute
-            ld_name, rest = path.split('/', 1)
-            ln_name, rest = rest.split('.', 1)
-            do_name, da_name = rest.split('.', 1)
-            
-            return self.devices[ld_name].nodes[ln_name].objects[do_name].attributes[da_name]
+            ld_name, ln_name, do_name, da_name = self._split_path(path)
+            da = self.devices[ld_name].nodes[ln_name].objects[do_name].attributes[da_name]
         except Exception as e:
-            print(f"Path lookup failed for {path}: {e}")
+            logger.warning("Path lookup failed for %s: %r", path, e)
             return None
+        self._path_index[path] = da
+        return da
 
 # ==========================================
 # 2. 报告机制 (Reporting Mechanism)
@@ -147,18 +293,36 @@ class IecServer:
 class ReportControlBlock:
     """
     RCB: 报告控制块。负责监听数据变化并发送报告。
+
+    buf_time_ms > 0 时启用缓冲 (对应 IEC 61850 的 BufTime):
+    窗口内的多次数据变化合并为一份报告，inclusion 标记本次变化的成员。
     """
-    def __init__(self, name: str, rpt_id: str, dataset: List[DataAttribute], parent: LogicalNode):
+    def __init__(self, name: str, rpt_id: str, dataset: List[DataAttribute], parent: LogicalNode,
+                 buf_time_ms: int = 0):
         self.name = name
         self.rpt_id = rpt_id
         self.dataset = dataset
         self.parent = parent
         self.enabled = False
         self.client_callback = None
+        self.buf_time_ms = buf_time_ms
+        # 数据集成员固定，报告的键 (路径) 与字典形状预先构建，发送时只填值
+        self._keys = tuple(da.full_path for da in dataset)
+        self._scratch: Dict[str, Any] = dict.fromkeys(self._keys)
+        # 各成员值所在的 (列数组, 下标)，构建报告时直接读数组，绕过 value 属性描述符
+        self._cells = tuple((da._values, da._idx) for da in dataset)
+        # 缓冲窗口内发生变化的 DA (按 id 去重) 及已调度的定时器
+        self._pending: Dict[int, DataAttribute] = {}
+        self._flush_handle = None
+        # 无事件循环时 _flush 在定时器线程执行: _lock 保护 _pending / _flush_handle 的写入与交换，
+        # _send_lock 保证前后两个窗口的报告不会并发构建 (共用 _scratch)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
         
-        # 内部绑定: 告诉数据集里的每个DA，如果变了，通知我
+        # 内部绑定: 在服务端订阅表中登记，数据集里的DA变了就通知我
+        subscribers = parent.server._subscribers
         for da in self.dataset:
-            da.trigger_callbacks.append(self.on_data_change)
+            subscribers.setdefault(id(da), []).append(self)
 
     def enable(self, callback: Callable):
         self.client_callback = callback
@@ -169,9 +333,46 @@ class ReportControlBlock:
         """
         当底层数据变化时被调用
         """
-        if self.enabled and self.client_callback:
-            print(f"[RCB] Triggered by {changed_da.name}. Sending Report...")
-            # 构建报告内容 (包含当前数据集所有值)
-            report_data = {da.get_full_path(): da.value for da in self.dataset}
-            # 这里的 Reason 应该是 dchg (DataChange)
-            self.client_callback(self.rpt_id, report_data, reason="dchg")
+        if not (self.enabled and self.client_callback):
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[RCB] Triggered by %s. Sending Report...", changed_da.name)
+        if self.buf_time_ms <= 0:
+            self._send_report({id(changed_da)})
+            return
+
+        # 缓冲模式: 记录变化，窗口结束时统一发送
+        with self._lock:
+            self._pending[id(changed_da)] = changed_da
+            if self._flush_handle is not None:
+                return
+            delay = self.buf_time_ms / 1000
+            try:
+                loop = asyncio.get_running_loop()
+                self._flush_handle = loop.call_later(delay, self._flush)
+            except RuntimeError:
+                # 无事件循环 (同步场景) 时使用后台定时器
+                timer = threading.Timer(delay, self._flush)
+                timer.daemon = True
+                self._flush_handle = timer
+                timer.start()
+
+    def _flush(self):
+        """缓冲窗口结束: 发送一份合并后的报告"""
+        with self._send_lock:
+            with self._lock:
+                self._flush_handle = None
+                pending, self._pending = self._pending, {}
+            if pending and self.enabled and self.client_callback:
+                self._send_report(pending.keys())
+
+    def _send_report(self, changed_ids):
+        # 构建报告内容 (包含当前数据集所有值)，复制一份交给客户端
+        scratch = self._scratch
+        for key, (values, idx) in zip(self._keys, self._cells, strict=True):
+            scratch[key] = values[idx]
+        report_data = scratch.copy()
+        # 包含位串: 标记数据集中哪些成员触发了本次报告
+        inclusion = [id(da) in changed_ids for da in self.dataset]
+        # 这里的 Reason 应该是 dchg (DataChange)
+        self.client_callback(self.rpt_id, report_data, reason="dchg", inclusion=inclusion)
@@ -1,14 +1,29 @@
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Union
 
-from influxdb_client import InfluxDBClient, Point, WritePrecision
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import InfluxDBClient, Point, WriteOptions, WritePrecision
+from influxdb_client.client.write_api import WriteApi
 from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+from influxdb_client.client.write_api_async import WriteApiAsync
 
 from src.common.config import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP 连接配置：写入请求启用 gzip 压缩 (line protocol 压缩率高)，连接池大小固定
+ENABLE_GZIP = True
+CONNECTION_POOL_MAXSIZE = 32
+
+# 批量写入配置：攒够 batch_size 个点或每隔 flush_interval 毫秒发送一次 HTTP 请求
+WRITE_BATCH_SIZE = 1000
+WRITE_FLUSH_INTERVAL_MS = 1000
+
+# 异步写入队列：后台协程攒够 batch_size 个点或等待 flush_interval 毫秒后发送一次请求
+ASYNC_QUEUE_MAXSIZE = 100_000
+ASYNC_BATCH_SIZE = 1000
+ASYNC_FLUSH_INTERVAL_MS = 50
+
 class InfluxDBManager:
     """
     InfluxDB 客户端管理器
@@ -27,32 +42,102 @@ class InfluxDBManager:
         self.bucket = bucket
         self._client: Optional[InfluxDBClient] = None
         self._async_client: Optional[InfluxDBClientAsync] = None
+        self._write_api: Optional[WriteApi] = None
+        self._async_write_api: Optional[WriteApiAsync] = None
+        # 异步写入队列与后台发送任务 (首次异步写入时创建)
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
 
     def get_client(self) -> InfluxDBClient:
         """获取同步客户端"""
         if self._client is None:
-            self._client = InfluxDBClient(url=self.url, token=self.token, org=self.org)
+            self._client = InfluxDBClient(
+                url=self.url,
+                token=self.token,
+                org=self.org,
+                enable_gzip=ENABLE_GZIP,
+                connection_pool_maxsize=CONNECTION_POOL_MAXSIZE,
+            )
         return self._client
 
     async def get_async_client(self) -> InfluxDBClientAsync:
         """获取异步客户端"""
         if self._async_client is None:
-            self._async_client = InfluxDBClientAsync(url=self.url, token=self.token, org=self.org)
+            self._async_client = InfluxDBClientAsync(
+                url=self.url,
+                token=self.token,
+                org=self.org,
+                enable_gzip=ENABLE_GZIP,
+                connection_pool_maxsize=CONNECTION_POOL_MAXSIZE,
+            )
+            self._async_write_api = self._async_client.write_api()
         return self._async_client
 
+    def get_write_api(self) -> WriteApi:
+        """
+        获取批量写入 API（全局复用一个实例）
+
+        后台线程按批次发送数据点，写入结果通过回调记录日志
+        """
+        if self._write_api is None:
+            self._write_api = self.get_client().write_api(
+                write_options=WriteOptions(
+                    batch_size=WRITE_BATCH_SIZE,
+                    flush_interval=WRITE_FLUSH_INTERVAL_MS,
+                    jitter_interval=0,
+                ),
+                success_callback=self._on_batch_success,
+                error_callback=self._on_batch_error,
+            )
+        return self._write_api
+
+    @staticmethod
+    def _on_batch_success(conf: tuple, data: str):
+        """批次写入成功回调"""
+        logger.debug("Successfully wrote batch to InfluxDB bucket: %s", conf[0])
+
+    @staticmethod
+    def _on_batch_error(conf: tuple, data: str, exception: Exception):
+        """批次写入失败回调"""
+        logger.error("Failed to write batch to InfluxDB bucket %s: %s", conf[0], exception)
+
     def write_point(self, point: Point, bucket: str = None):
         """
-        同步写入个数据点
+        写入一个数据点（进入批量写入队列，不等待发送）
+        """
+        self.write_points([point], bucket)
+
+    def write_points(self, points: List[Point], bucket: str = None):
+        """
+        写入多个数据点（一次提交到批量写入队列）
+        """
+        target_bucket = bucket or self.bucket
+        self.get_write_api().write(bucket=target_bucket, org=self.org, record=points)
+
+    def write_lp(self, lines: List[str], bucket: str = None, precision: WritePrecision = WritePrecision.NS):
+        """
+        直接写入 line protocol 字符串（进入批量写入队列，不等待发送）
+
+        字段、标签固定且无需转义时使用，跳过 Point 对象构建与序列化
+
+        Args:
+            lines: line protocol 行，例如 "measurement,tag=a field=1.0 1700000000000000000"
+            bucket: 目标 bucket，默认使用配置的 bucket
+            precision: 行内时间戳的精度，默认纳秒
         """
         target_bucket = bucket or self.bucket
-        client = self.get_client()
-        write_api = client.write_api(write_options=SYNCHRONOUS)
-        try:
-            write_api.write(bucket=target_bucket, org=self.org, record=point)
-            logger.info(f"Successfully wrote point to InfluxDB bucket: {target_bucket}")
-        except Exception as e:
-            logger.error(f"Failed to write point to InfluxDB: {e}")
-            raise
+        self.get_write_api().write(bucket=target_bucket, org=self.org, record=lines, write_precision=precision)
+
+    def flush(self):
+        """
+        发送队列中尚未写入的数据点
+
+        WriteApi.flush() 在批量模式下未实现，这里关闭当前写入 API（关闭前会发送剩余数据），
+        下次写入时重新创建
+        """
+        if self._write_api is not None:
+            self._write_api.close()
+            self._write_api = None
 
     def write_data(self, measurement: str, tags: Dict[str, str], fields: Dict[str, Any], bucket: str = None):
         """
@@ -66,26 +151,67 @@ class InfluxDBManager:
         
         self.write_point(point, bucket)
 
-    async def write_point_async(self, point: Point, bucket: str = None):
+    async def write_point_async(self, point: Union[Point, List[Point]], bucket: str = None):
         """
-        异步写入一个数据点
+        异步写入数据点（单个或列表）
+
+        数据点放入队列后立即返回，由后台协程合并成批次发送；队列满时等待（背压）
         """
+        if self._flusher is None:
+            await self.get_async_client()
+            self._queue = asyncio.Queue(maxsize=ASYNC_QUEUE_MAXSIZE)
+            self._flusher = asyncio.create_task(self._drain_loop())
+
         target_bucket = bucket or self.bucket
-        client = await self.get_async_client()
-        write_api = client.write_api()
-        try:
-            await write_api.write(bucket=target_bucket, org=self.org, record=point)
-            logger.info(f"Successfully wrote point (async) to InfluxDB bucket: {target_bucket}")
-        except Exception as e:
-            logger.error(f"Failed to write point (async) to InfluxDB: {e}")
-            raise
+        points = point if isinstance(point, list) else [point]
+        for p in points:
+            await self._queue.put((target_bucket, p))
+
+    async def _drain_loop(self):
+        """后台发送协程：每批最多 ASYNC_BATCH_SIZE 个点，最多等待 ASYNC_FLUSH_INTERVAL_MS 毫秒"""
+        queue = self._queue
+        interval = ASYNC_FLUSH_INTERVAL_MS / 1000
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + interval
+            while len(batch) < ASYNC_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # 按 bucket 分组，每组一次请求
+            by_bucket: Dict[str, List[Point]] = {}
+            for target_bucket, p in batch:
+                by_bucket.setdefault(target_bucket, []).append(p)
+            for target_bucket, points in by_bucket.items():
+                try:
+                    await self._async_write_api.write(bucket=target_bucket, org=self.org, record=points)
+                    logger.info("Successfully wrote %d points (async) to InfluxDB bucket: %s", len(points), target_bucket)
+                except Exception as e:
+                    logger.error("Failed to write points (async) to InfluxDB: %s", e)
+            for _ in batch:
+                queue.task_done()
 
     async def close(self):
-        """关闭连接"""
+        """关闭连接（异步队列中剩余的数据点发送完后再关闭）"""
+        self.flush()
         if self._client:
             self._client.close()
+            self._client = None
+        if self._flusher is not None:
+            await self._queue.join()
+            self._flusher.cancel()
+            self._flusher = None
+            self._queue = None
         if self._async_client:
             await self._async_client.close()
+            self._async_client = None
+            self._async_write_api = None
 
 # 全局单例
 influx_manager = InfluxDBManager()
@@ -1,40 +1,74 @@
 import random
 import time
 import asyncio
-from datetime import datetime
-from influxdb_client import Point
+from influxdb_client import Point, WritePrecision
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 try:
     from .client import influx_manager
 except ImportError:
     from client import influx_manager
 
+
+def generate_readings(ticks: int, batteries: int):
+    """
+    一次性生成 ticks × batteries 组模拟读数
+    安装 numpy 时批量生成随机数并向量化取整，否则回退到 random 逐个生成
+
+    Returns:
+        (voltages, currents, temperatures)，均为 [tick][battery] 的嵌套列表
+    """
+    if HAS_NUMPY:
+        rng = np.random.default_rng()
+        shape = (ticks, batteries)
+        voltages = rng.uniform(3.2, 4.2, shape).round(2)
+        currents = rng.uniform(0.5, 2.0, shape).round(2)
+        temperatures = rng.uniform(20.0, 45.0, shape).round(1)
+        return voltages.tolist(), currents.tolist(), temperatures.tolist()
+
+    def uniform(low, high, ndigits):
+        return [[round(random.uniform(low, high), ndigits) for _ in range(batteries)] for _ in range(ticks)]
+
+    return uniform(3.2, 4.2, 2), uniform(0.5, 2.0, 2), uniform(20.0, 45.0, 1)
+
+
 def simulate_battery_data():
     """
     模拟电池数据并同步写入 InfluxDB
     """
     print("Starting synchronous battery data simulation...")
     battery_ids = ["BATT-001", "BATT-002", "BATT-003"]
+    voltages, currents, temperatures = generate_readings(10, len(battery_ids))
+    # 每个电池的 measurement + 标签部分固定，预先拼好
+    prefixes = [f"battery_stats,battery_id={batt_id},location=Warehouse-A " for batt_id in battery_ids]
     
+    # 按单调时钟的固定截止时间节拍，写入耗时不会累积成周期漂移
+    next_deadline = time.monotonic()
     for i in range(10):
-        for batt_id in battery_ids:
-            voltage = round(random.uniform(3.2, 4.2), 2)
-            current = round(random.uniform(0.5, 2.0), 2)
-            temperature = round(random.uniform(20.0, 45.0), 1)
+        next_deadline += 1.0
+        lines = []
+        ts = time.time_ns()
+        for j, batt_id in enumerate(battery_ids):
+            voltage = voltages[i][j]
+            current = currents[i][j]
+            temperature = temperatures[i][j]
             
-            # 创建 Point 对象
-            point = Point("battery_stats") \
-                .tag("battery_id", batt_id) \
-                .tag("location", "Warehouse-A") \
-                .field("voltage", voltage) \
-                .field("current", current) \
-                .field("temperature", temperature) \
-                .time(datetime.utcnow())
+            # 标签、字段固定，直接拼接 line protocol
+            lines.append(f"{prefixes[j]}voltage={voltage},current={current},temperature={temperature} {ts}")
             
             print(f"Writing: {batt_id} | Voltage: {voltage}V, Current: {current}A, Temp: {temperature}C")
-            influx_manager.write_point(point)
         
-        time.sleep(1)
+        # 每秒一批，一次提交本轮所有电池的数据点 (进入后台批量队列，不阻塞)
+        influx_manager.write_lp(lines)
+        time.sleep(max(0.0, next_deadline - time.monotonic()))
+
+    # 发送剩余数据点
+    influx_manager.flush()
     print("Synchronous simulation completed.")
 
 async def simulate_battery_data_async():
@@ -43,13 +77,14 @@ async def simulate_battery_data_async():
     """
     print("\nStarting asynchronous battery data simulation...")
     battery_ids = ["BATT-001", "BATT-002", "BATT-003"]
+    voltages, currents, temperatures = generate_readings(5, len(battery_ids))
     
     for i in range(5):
-        tasks = []
-        for batt_id in battery_ids:
-            voltage = round(random.uniform(3.2, 4.2), 2)
-            current = round(random.uniform(0.5, 2.0), 2)
-            temperature = round(random.uniform(20.0, 45.0), 1)
+        points = []
+        for j, batt_id in enumerate(battery_ids):
+            voltage = voltages[i][j]
+            current = currents[i][j]
+            temperature = temperatures[i][j]
             
             point = Point("battery_stats") \
                 .tag("battery_id", batt_id) \
@@ -57,12 +92,13 @@ async def simulate_battery_data_async():
                 .field("voltage", voltage) \
                 .field("current", current) \
                 .field("temperature", temperature) \
-                .time(datetime.utcnow())
+                .time(time.time_ns(), WritePrecision.NS)
             
             print(f"Writing (Async): {batt_id} | Voltage: {voltage}V")
-            tasks.append(influx_manager.write_point_async(point))
+            points.append(point)
         
-        await asyncio.gather(*tasks)
+        # 本轮所有电池的数据点一次请求写入
+        await influx_manager.write_point_async(points)
         await asyncio.sleep(1)
     
     await influx_manager.close()
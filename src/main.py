@@ -1,7 +1,9 @@
 """
 FastAPI 应用主入口
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,7 +12,28 @@ from src.common.config import settings
 from src.common.database import Base, db_manager
 from src.common.error_handlers import setup_exception_handlers
 from src.common.middleware import RequestLoggingMiddleware, setup_sql_logging
+from src.common.responses import ORJSONResponse
+from src.projectApi.service import (
+    ACTIVITY_LOG_DRAIN_TIMEOUT,
+    ACTIVITY_LOG_QUEUE_MAXSIZE,
+    activity_log_consumer,
+)
 from src.utils.logger import logger
+from src.utils.sql_logger import sql_logger
+
+
+# 服务器时间缓存的刷新间隔（秒）
+SERVER_TIME_REFRESH_INTERVAL = 0.5
+
+
+async def refresh_server_time(app: FastAPI) -> None:
+    """
+    定期刷新 app.state.server_time（秒级精度的 ISO 时间字符串）
+    接口直接读取缓存值，不必每次请求都获取并格式化当前时间
+    """
+    while True:
+        app.state.server_time = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(SERVER_TIME_REFRESH_INTERVAL)
 
 
 @asynccontextmanager
@@ -26,8 +49,12 @@ async def lifespan(app: FastAPI):
 
     # 设置 SQL 日志记录
     engine = db_manager.get_engine()
+    sql_logger.start()
     setup_sql_logging(engine)
-    logger.info("SQL 日志已启用，日志文件: logs/sql_YYYY-MM-DD.log")
+    if sql_logger.is_enabled():
+        logger.info("SQL 日志已启用，日志文件: logs/sql_YYYY-MM-DD.log")
+    else:
+        logger.info("SQL 语句日志已关闭 (SQL_LOG_ENABLED=false)，仅记录 SQL 错误")
 
     # 创建数据库表（开发环境）
     if settings.ENVIRONMENT.value == "development":
@@ -37,13 +64,33 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
             logger.info("数据库表已创建/更新")
 
+    # 活动日志队列（有界）及其常驻消费任务
+    app.state.activity_log_queue = asyncio.Queue(maxsize=ACTIVITY_LOG_QUEUE_MAXSIZE)
+    app.state.activity_log_task = asyncio.create_task(
+        activity_log_consumer(app.state.activity_log_queue)
+    )
+
+    # 服务器时间缓存：先同步写入一次，保证启动后立即可读
+    app.state.server_time = datetime.now().isoformat(timespec="seconds")
+    app.state.server_time_task = asyncio.create_task(refresh_server_time(app))
+
     logger.info("应用启动完成")
 
     yield
 
     # 关闭时
     logger.info("正在关闭应用...")
+    # 先等待已入队的活动日志处理完，超时后剩余条目随消费任务一起取消
+    try:
+        await asyncio.wait_for(app.state.activity_log_queue.join(), ACTIVITY_LOG_DRAIN_TIMEOUT)
+    except TimeoutError:
+        logger.warning("活动日志未处理完，丢弃 %d 条", app.state.activity_log_queue.qsize())
+    for task in (app.state.activity_log_task, app.state.server_time_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await db_manager.close_all()
+    sql_logger.stop()
     logger.info("应用已关闭")
 
 
@@ -57,6 +104,8 @@ def create_app() -> FastAPI:
         "description": settings.APP_DESCRIPTION,
         "version": settings.APP_VERSION,
         "lifespan": lifespan,
+        # 默认使用 orjson 序列化响应
+        "default_response_class": ORJSONResponse,
     }
 
     # 根据环境配置文档
@@ -116,6 +165,8 @@ app = create_app()
 
 
 if __name__ == "__main__":
+    import importlib.util
+
     import uvicorn
 
     uvicorn.run(
@@ -124,5 +175,7 @@ if __name__ == "__main__":
         port=settings.PORT,
         reload=settings.DEBUG,
         workers=settings.WORKERS,
+        # 安装了 uvloop (uvicorn[standard]) 时显式使用，否则回退到标准 asyncio 事件循环
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
     )
 
@@ -6,9 +6,10 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import Integer, String, DateTime, Text, JSON, Index, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.common.models import BaseModel
+from src.demo.models import Item
 
 
 class User(BaseModel):
@@ -58,6 +59,12 @@ class User(BaseModel):
     # created_at: Mapped[datetime]
     # updated_at: Mapped[datetime]
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime, default=None, comment="软删除时间")
+
+    # 关联（异步会话不支持隐式懒加载，需通过 selectinload 等显式加载）
+    items: Mapped[list[Item]] = relationship(
+        primaryjoin="User.id == foreign(Item.user_id)",
+        lazy="raise",
+    )
     
     # 索引
     __table_args__ = (
@@ -1,5 +1,7 @@
-import asyncio
+import logging
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Optional, Dict
 
 from fastapi import (
@@ -12,7 +14,6 @@ from fastapi import (
     Cookie,
     HTTPException,
     status,
-    BackgroundTasks,
     File,
     UploadFile,
     Form,
@@ -21,15 +22,33 @@ from fastapi import (
 from pydantic import BaseModel, Field, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.common.database import get_db
+from src.common.database import get_db, get_db_readonly
+from src.common.responses import ORJSONResponse
 from src.common.schemas import ResponseModel
-from src.projectApi.service import get_users, get_user_id, create_user_raw
+from src.projectApi.service import get_user_id, create_user_raw, enqueue_activity_log
 from src.projectApi.schemas import UserResponse, UserCreate
+from src.utils.logger import logger
 
 # 1. 初始化 APIRouter
 # prefix: 路由前缀，tags: 自动生成文档的分组标签
 router = APIRouter(prefix="/projectApi", tags=["FastAPI核心核心学习接口"])
 
+# 参数化的响应模型在模块加载时创建一次，路由中直接复用
+DictResponse = ResponseModel[Dict[str, Any]]
+
+
+def dict_response(
+    code: int,
+    message: str,
+    data: Any = None,
+    status_code: int = status.HTTP_200_OK,
+) -> ORJSONResponse:
+    """
+    按 DictResponse 的结构直接返回 JSON
+    跳过 ResponseModel 的构造与 response_model 的二次校验，路由上的 response_model 仅用于文档
+    """
+    return ORJSONResponse({"code": code, "message": message, "data": data}, status_code=status_code)
+
 # ==========================================
 # 2. Pydantic 模型 (Schemas) - 核心知识点 1
 # ==========================================
@@ -88,8 +107,16 @@ class UserContext:
         return f"Request from {self.platform}"
 
 # (3) 权限校验伪造逻辑（子依赖示例）
+@lru_cache(maxsize=4096)
+def decode_token(token: str) -> str | None:
+    """
+    校验并解析令牌（纯函数，按令牌缓存结果）
+    真实场景中这里是 JWT 验签或数据库查询，同一客户端的重复请求直接命中缓存
+    """
+    return token if token == "super-secret-token" else None
+
 async def verify_token(x_token: str = Header(..., convert_underscores=False, description="模拟 Token 校验")):
-    if x_token != "super-secret-token":
+    if decode_token(x_token) is None:
         # 抛出 HTTPException 是 FastAPI 处理错误的推荐方式
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,54 +124,74 @@ async def verify_token(x_token: str = Header(..., convert_underscores=False, des
         )
     return x_token
 
+# (4) 组合依赖：把接口需要的请求上下文合并为一个依赖，一次解析、一个缓存键
+@dataclass(slots=True)
+class RequestCtx:
+    commons: dict
+    user_agent: Optional[str]
+    session_id: Optional[str]
+    session_card: Optional[str]
+    ctx: UserContext
+    token: str
+
+async def request_ctx(
+    user_agent: str = Header(None),
+    session_id: Optional[str] = Cookie(None),
+    session_card: Optional[str] = Cookie(None),
+    ctx: UserContext = Depends(UserContext),
+    token: str = Depends(verify_token), # 权限检查
+    commons: dict = Depends(common_parameters),
+) -> RequestCtx:
+    return RequestCtx(
+        commons=commons,
+        user_agent=user_agent,
+        session_id=session_id,
+        session_card=session_card,
+        ctx=ctx,
+        token=token,
+    )
+
 # ==========================================
 # 4. 复杂核心接口示例
 # ==========================================
 
 @router.post(
     "/advanced-learning/",
-    response_model=ResponseModel, # 指定响应模型，自动递归校验和序列化
+    response_model=DictResponse, # 指定响应模型 (用于文档，直接返回 Response 时不再校验)
     status_code=status.HTTP_201_CREATED, # 定义成功返回的状态码
     summary="FastAPI 核心技术综合演示接口",
     description="这个接口集成了：路径参数、查询参数、请求体、Header、Cookie、依赖注入、后台任务、文件上传等核心技术。"
 )
 async def core_learning_endpoint(
+    # 请求对象 (用于访问 app.state 上的活动日志队列)
+    request: Request,
+
     # A. 路径参数 (Path Parameters)
     user_id: str = Query(..., description="用户唯一标识，必须大于等于1"),
     
     # B. 请求体 (Request Body) - 自动解析 JSON
     payload: AdvancedRequest = Body(..., description="复杂的 JSON 负载"),
     
-    # C. 查询参数 (Query Parameters) - 提取分页和搜索信息
-    commons: dict = Depends(common_parameters),
-    
-    # D. 头部和 Cookie (Header & Cookie)
-    user_agent: str = Header(None),
-    session_id: Optional[str] = Cookie(None),
-    session_card: Optional[str] = Cookie(None),
+    # C. 查询参数、Header、Cookie、权限校验 (组合依赖: 分页搜索 + 头部 + Cookie + 上下文 + Token)
+    rc: RequestCtx = Depends(request_ctx),
     
-    # E. 依赖注入 (Dependencies)
-    ctx: UserContext = Depends(UserContext),
-    token: str = Depends(verify_token), # 权限检查
+    # D. 依赖注入 (Dependencies)
     db: AsyncSession = Depends(get_db), # 数据库会话
-    
-    # F. 后台任务 (Background Tasks)
-    background_tasks: BackgroundTasks = None
 ):
     """
     接口的主逻辑。
     """
     # 模拟业务处理
-    print(f"当前平台: {ctx.get_platform_info()}")
-    print(f"Token 验证通过: {token}")
+    ctx = rc.ctx
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("当前平台: %s", ctx.get_platform_info())
+        logger.debug("Token 验证通过: %s", rc.token)
     
-    # 后台任务演示：接口不需要等待此任务完成即可返回
-    async def log_activity(username: str):
-        await asyncio.sleep(2) # 模拟耗时操作
-        print(f"日志记录: 用户 {username} 完成了高级演示调用")
-    
-    if background_tasks:
-        background_tasks.add_task(log_activity, payload.username)
+    # 后台任务演示：放入活动日志队列后立即返回，由常驻消费协程记录 (见 lifespan)
+    # 未经 lifespan 启动时 app.state 上没有队列和时间缓存，回退到直接创建任务 / 实时取时间
+    state = request.app.state
+    enqueue_activity_log(getattr(state, "activity_log_queue", None), payload.username)
+    server_time = getattr(state, "server_time", None) or datetime.now().isoformat(timespec="seconds")
 
     # 业务逻辑：查询数据库示例（复用现有 service）
     # user_data = await get_user_id(db=db, user_id=user_id)
@@ -153,25 +200,30 @@ async def core_learning_endpoint(
     result = {
         "received_params": {
             "user_id": user_id,
-            "query": commons,
-            "headers": {"user_agent": user_agent},
-            "cookies": {"session_id": session_id, "session_card": session_card}
+            "query": rc.commons,
+            "headers": {"user_agent": rc.user_agent},
+            "cookies": {"session_id": rc.session_id, "session_card": rc.session_card}
         },
-        "payload_echo": payload.model_dump(),
+        "payload_echo": payload, # 已校验的模型直接交给响应序列化，不再先 model_dump 成字典
         "platform_context": ctx.get_platform_info(),
-        "server_time": datetime.now().isoformat()
+        "server_time": server_time,
     }
 
-    return ResponseModel(
+    # 直接返回 Response 时装饰器上的 status_code 不生效，需要显式传入
+    return dict_response(
         code=200,
         message="恭喜通过核心知识点学习！",
-        data=result
+        data=result,
+        status_code=status.HTTP_201_CREATED,
     )
 
 # ==========================================
 # 5. 其他常用接口形态展示
 # ==========================================
 
+# 上传文件分块读取的大小
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 @router.post("/upload-logic", summary="文件上传 + 表单字段")
 async def upload_demo(
     # File 用于接收文件二进制，UploadFile 包含文件名、内容类型等元数据
@@ -184,29 +236,35 @@ async def upload_demo(
     """
     展示如何同时接收文件和表单数据
     """
-    content = await file.read() # 异步读取文件内容
+    # 按 1MB 分块读取，只累计大小，不把整个文件读入内存
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
     return {
         "filename": file.filename,
         "content_type": file.content_type,
         "title": title,
-        "file_size_kb": len(content) / 1024
+        "file_size_kb": size / 1024
     }
 
 # ==========================================
 # 6. 异常处理演示
 # ==========================================
 
+# 演示用的状态码 -> 错误信息
+ERROR_DETAILS = {
+    400: "典型的客户端错误",
+    403: "没有访问权限",
+    500: "服务器内部炸了",
+}
+
 @router.get("/error-demo/{code}", summary="异常处理演示")
 async def trigger_error(code: int):
     """
     手动抛出不同状态码的异常
     """
-    if code == 400:
-        raise HTTPException(status_code=400, detail="典型的客户端错误")
-    if code == 403:
-        raise HTTPException(status_code=403, detail="没有访问权限")
-    if code == 500:
-        raise HTTPException(status_code=500, detail="服务器内部炸了")
+    if (detail := ERROR_DETAILS.get(code)) is not None:
+        raise HTTPException(status_code=code, detail=detail)
     
     return {"message": "一切正常", "input_code": code}
 
@@ -215,43 +273,44 @@ async def trigger_error(code: int):
 # ==========================================
 from src.projectApi.service import get_user_stats_raw
 
-@router.get("/sql-demo/{user_id}", summary="原生 SQL 查询演示")
+@router.get("/sql-demo/{user_id}", response_model=DictResponse, summary="原生 SQL 查询演示")
 async def sql_learning_demo(
     user_id: int = Path(..., description="用户ID"),
-    db: AsyncSession = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_db_readonly)
+) -> ORJSONResponse:
     """
     展示如何在接口中调用原生 SQL 逻辑
     """
     stats = await get_user_stats_raw(db, user_id)
     
     if not stats:
-        return ResponseModel(code=404, message="未找到对应的 SQL 数据统计", data=None)
+        return dict_response(code=404, message="未找到对应的 SQL 数据统计")
 
-    return ResponseModel(
+    return dict_response(
         code=200, 
         message="原生 SQL 查询成功！", 
         data=stats
     )
 
 @router.post("/create-user", summary="创建用户")
-async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    return await create_user_raw(db, user)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)) -> ORJSONResponse:
+    # 数据库行字典直接由 orjson 序列化，跳过 jsonable_encoder
+    return ORJSONResponse(await create_user_raw(db, user))
 
 # 原有逻辑保留/重构供参考
-@router.get("/info", summary="原有用户信息查询接口", deprecated=True)
+@router.get("/info", response_model=DictResponse, summary="原有用户信息查询接口", deprecated=True)
 async def get_project_info(
     just_id: str = Query(..., description="用户ID"),
-    db: AsyncSession = Depends(get_db),
-) -> ResponseModel:
+    db: AsyncSession = Depends(get_db_readonly),
+) -> ORJSONResponse:
     """这里保留原有的简单逻辑，可以和上面的 Complex 接口做对比学习"""
     try:
         user_id_int = int(just_id)
         result_obj = await get_user_id(db=db, user_id=user_id_int)
         
         if result_obj is None:
-            return ResponseModel(code=404, message="用户不存在", data=None)
+            return dict_response(code=404, message="用户不存在")
 
-        return ResponseModel(code=200, message="success", data=result_obj)
+        return dict_response(code=200, message="success", data=result_obj)
     except Exception as e:
-        return ResponseModel(code=500, message=str(e), data=None)
+        return dict_response(code=500, message=str(e))
@@ -2,12 +2,11 @@
 用户模块 - Pydantic 模型（Schema）
 演示请求和响应模型的定义
 """
-from datetime import datetime
 from typing import Any
 
 from pydantic import Field, EmailStr
 
-from src.common.schemas import CustomModel
+from src.common.schemas import CustomModel, FormattedDateTime
 
 
 class UserBase(CustomModel):
@@ -71,16 +70,16 @@ class UserResponse(UserBase):
     status: int = Field(1, description="账号状态")
     
     register_source: str = Field("miniprogram", description="注册来源")
-    first_login_time: datetime | None = Field(None, description="首次登录时间")
-    last_login_time: datetime | None = Field(None, description="最后登录时间")
+    first_login_time: FormattedDateTime | None = Field(None, description="首次登录时间")
+    last_login_time: FormattedDateTime | None = Field(None, description="最后登录时间")
     login_count: int = Field(0, description="登录次数")
     last_login_ip: str | None = Field(None, description="最后登录IP")
     
     extra_info: dict | None = Field(None, description="扩展信息")
     
-    created_at: datetime = Field(..., description="创建时间")
-    updated_at: datetime = Field(..., description="更新时间")
-    deleted_at: datetime | None = Field(None, description="删除时间")
+    created_at: FormattedDateTime = Field(..., description="创建时间")
+    updated_at: FormattedDateTime = Field(..., description="更新时间")
+    deleted_at: FormattedDateTime | None = Field(None, description="删除时间")
 
 
 class UserListResponse(CustomModel):
@@ -2,10 +2,12 @@
 用户模块 - 业务逻辑层
 演示如何组织业务逻辑
 """
+import asyncio
 from typing import Any
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import Integer, bindparam, func, select, text
+from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud import BaseCRUD
@@ -13,6 +15,7 @@ from src.projectApi.models import User
 from src.demo.models import Item
 from src.projectApi.schemas import UserCreate, UserResponse, UserUpdate
 from src.common.exceptions import NotFoundException
+from src.utils.logger import logger
 
 
 class UserCRUD(BaseCRUD[User, UserCreate, UserUpdate]):
@@ -24,6 +27,31 @@ class UserCRUD(BaseCRUD[User, UserCreate, UserUpdate]):
 user_crud = UserCRUD(User)
 
 
+# get_users 的可选过滤条件，按位组合成掩码：status=1, is_active=2, user_type=4
+_USER_FILTERS = (
+    User.status == bindparam("status"),
+    User.is_active == bindparam("is_active"),
+    User.user_type == bindparam("user_type"),
+)
+
+
+def _build_user_list_stmts(mask: int) -> tuple[Any, Any]:
+    """按过滤掩码构建 (列表查询, 计数查询)，分页参数也作为绑定参数"""
+    conds = [cond for bit, cond in enumerate(_USER_FILTERS) if mask >> bit & 1]
+    data_stmt = (
+        select(*User.__table__.columns)
+        .where(*conds)
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_stmt = select(func.count()).select_from(User).where(*conds)
+    return data_stmt, count_stmt
+
+
+# 8 种过滤组合的语句在导入时构建一次，执行时命中 SQLAlchemy 编译缓存
+_USER_LIST_STMTS = {mask: _build_user_list_stmts(mask) for mask in range(1 << len(_USER_FILTERS))}
+
+
 # 业务逻辑函数
 
 async def get_user_by_id(db: AsyncSession, user_id: int) -> dict[str, Any]:
@@ -45,32 +73,31 @@ async def get_user_by_openid(db: AsyncSession, openid: str) -> dict[str, Any] |
 async def get_user_id(db: AsyncSession, user_id: int) -> dict[str, Any] | None:
     """
     根据用户ID获取用户及其关联的Item，返回字典或 None
+
+    主键查询用户，关联的 Item 通过 selectinload 一次 IN 查询批量加载，只取需要的列
     """
     result = await db.execute(
-        select(User.nickname, Item.name).outerjoin(
-            User, User.id == Item.id
-        ).where(
-            User.id == user_id
+        select(User)
+        .where(User.id == user_id)
+        .options(
+            load_only(User.nickname),
+            selectinload(User.items).load_only(Item.name),
         )
     )
-    
-    result_handle = result.all()
-    
+    user = result.scalars().one_or_none()
+
     # 如果没有查询到数据，返回 None
-    if not result_handle:
+    if user is None:
         return None
-    
-    # 提取第一条记录的用户昵称（所有记录的用户昵称相同）
-    user_nickname = result_handle[0].nickname
-    
+
     # 构建返回字典
     return {
-        "nickname": user_nickname,
+        "nickname": user.nickname,
         "items": [
-            {"item_name": row.name}
-            for row in result_handle
+            {"item_name": item.name}
+            for item in user.items
         ],
-        "item_count": len(result_handle)
+        "item_count": len(user.items)
     }
 
 async def get_users(
@@ -83,24 +110,18 @@ async def get_users(
 ) -> dict[str, Any]:
     """
     获取用户列表
+
+    按过滤条件组合选取预构建的语句，返回格式与 get_multi 一致：{"data": [...], "total_count": n}
     """
-    filters = {}
-    if status is not None:
-        filters["status"] = status
-    if is_active is not None:
-        filters["is_active"] = is_active
-    if user_type is not None:
-        filters["user_type"] = user_type
+    mask = (status is not None) | (is_active is not None) << 1 | (user_type is not None) << 2
+    data_stmt, count_stmt = _USER_LIST_STMTS[mask]
+    params = {"status": status, "is_active": is_active, "user_type": user_type}
 
-    result = await user_crud.get_multi(
-        db=db,
-        offset=offset,
-        limit=limit,
-        **filters,
-    )
+    result = await db.execute(data_stmt, {**params, "offset": offset, "limit": limit})
+    data = [dict(row) for row in result.mappings()]
+    total_count = (await db.execute(count_stmt, params)).scalar_one()
 
-    
-    return result
+    return {"data": data, "total_count": total_count}
 
 
 async def create_user(db: AsyncSession, user_data: UserCreate) -> dict[str, Any]:
@@ -110,7 +131,6 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> dict[str, Any]
     return await user_crud.create_and_get(
         db=db,
         object=user_data,
-        openid=user_data.openid,
     )
 
 
@@ -134,35 +154,75 @@ async def update_user(
 # ==========================================
 # 原生 SQL 操作演示 - 核心知识点 3
 # ==========================================
-from sqlalchemy import text
+
+# SQL 语句在模块加载时构建一次，并声明参数类型，执行时不再重复构建 TextClause 和推断类型
+# 注意：原生 SQL 不会触发 Python 层的默认值，NOT NULL 列需要全部显式给值，
+# created_at 和 updated_at 使用 CURRENT_TIMESTAMP（MySQL、PostgreSQL、SQLite 通用）
+SQL_INSERT_USER = text("""
+    INSERT INTO users (
+        openid, unionid, session_key, nickname, avatar_url, gender,
+        country, province, city, language, phone_number, country_code,
+        is_active, is_verified, user_type, status, register_source, login_count,
+        created_at, updated_at
+    )
+    VALUES (
+        :openid, :unionid, :session_key, :nickname, :avatar_url, :gender,
+        :country, :province, :city, :language, :phone_number, :country_code,
+        :is_active, :is_verified, :user_type, :status, :register_source, :login_count,
+        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    )
+""")
+
+# 支持 RETURNING 的数据库（PostgreSQL、SQLite、MariaDB 10.5+）插入并返回整行，一次往返
+SQL_INSERT_USER_RETURNING = text(SQL_INSERT_USER.text + "    RETURNING *\n")
+
+# UserCreate 不包含的账号状态列，取模型上声明的默认值（与 ORM 插入保持一致）
+USER_RAW_DEFAULTS = {
+    name: User.__table__.c[name].default.arg
+    for name in ("is_active", "is_verified", "user_type", "status", "register_source", "login_count")
+}
+
+SQL_SELECT_USER = text("SELECT * FROM users WHERE id = :uid").bindparams(
+    bindparam("uid", type_=Integer)
+)
+
+# 使用 :param_name 占位符防止 SQL 注入（核心安全知识）
+SQL_USER_STATS = text("""
+    SELECT 
+        id, 
+        nickname, 
+        login_count,
+        created_at,
+        -- 这里演示数据库特有的逻辑（假设 MySQL）
+        CASE 
+            WHEN login_count > 10 THEN '活跃用户'
+            WHEN login_count > 0 THEN '普通用户'
+            ELSE '静默用户'
+        END as user_level
+    FROM users 
+    WHERE id = :uid AND deleted_at IS NULL
+""").bindparams(bindparam("uid", type_=Integer))
+
 
 async def create_user_raw(db: AsyncSession, user_data: UserCreate) -> dict[str, Any]:
     """
     创建用户
     """
-    # 1. 定义插入语句
-    # 注意：MySQL 不支持 RETURNING，我们需要分为插入和查询两步
-    # 同时手动处理 created_at 和 updated_at，因为原生 SQL 不会触发 Python 层的默认值
-    sql_insert = text("""
-        INSERT INTO users (nickname, openid, user_type, status, is_active, created_at, updated_at)
-        VALUES (:nickname, :openid, :user_type, :status, :is_active, NOW(), NOW())
-    """)
-    
-    # 2. 执行插入
-    result = await db.execute(sql_insert, {
-        "nickname": user_data.nickname,
-        "openid": user_data.openid,
-        "user_type": user_data.user_type,
-        "status": user_data.status,
-        "is_active": user_data.is_active,
-    })
+    params = {**user_data.model_dump(), **USER_RAW_DEFAULTS}
+
+    # 1. 数据库支持 RETURNING 时，插入并直接返回整行
+    if db.get_bind().dialect.insert_returning:
+        result = await db.execute(SQL_INSERT_USER_RETURNING, params)
+        return dict(result.mappings().one())
+
+    # 2. MySQL 不支持 RETURNING，我们需要分为插入和查询两步（插入语句见 SQL_INSERT_USER）
+    result = await db.execute(SQL_INSERT_USER, params)
     
     # 3. 获取刚刚生成的 ID (SQLAlchemy 异步模式下获取 lastrowid 的标准做法)
     inserted_id = result.lastrowid
     
     # 4. 查询并返回完整数据
-    sql_select = text("SELECT * FROM users WHERE id = :uid")
-    final_result = await db.execute(sql_select, {"uid": inserted_id})
+    final_result = await db.execute(SQL_SELECT_USER, {"uid": inserted_id})
     
     return dict(final_result.mappings().one())
     
@@ -173,29 +233,12 @@ async def get_user_stats_raw(db: AsyncSession, user_id: int) -> dict[str, Any]:
     适用于：需要极高性能、使用数据库特有函数、或 ORM 难以表达的复杂 JOIN/聚合。
     """
     
-    # 1. 定义原生 SQL 语句
-    # 使用 :param_name 占位符防止 SQL 注入（核心安全知识）
-    # 使用 text() 函数包装字符串
-    sql_query = text("""
-        SELECT 
-            id, 
-            nickname, 
-            login_count,
-            created_at,
-            -- 这里演示数据库特有的逻辑（假设 MySQL）
-            CASE 
-                WHEN login_count > 10 THEN '活跃用户'
-                WHEN login_count > 0 THEN '普通用户'
-                ELSE '静默用户'
-            END as user_level
-        FROM users 
-        WHERE id = :uid AND deleted_at IS NULL
-    """)
+    # 1. 原生 SQL 语句见 SQL_USER_STATS（使用 text() 函数包装字符串）
     
     # 2. 执行查询
     # db.execute 是异步方法，必须 await
     # params 传入一个字典进行参数绑定
-    result = await db.execute(sql_query, {"uid": user_id})
+    result = await db.execute(SQL_USER_STATS, {"uid": user_id})
     
     # 3. 处理结果
     # 对于 SELECT 语句，.fetchone() 返回 Row 对象
@@ -246,4 +289,72 @@ async def update_login_info(
     # 增加登录次数
     update_data["login_count"] = (user.get("login_count") or 0) + 1
     
-    await user_crud.update(db=db, object=update_data, id=user_id)
\ No newline at end of file
+    await user_crud.update(db=db, object=update_data, id=user_id)
+
+
+# 活动日志（耗时操作），由后台消费协程并发处理，不占用请求处理流程
+
+# 队列上限（超出时丢弃并告警，避免持续高负载下内存无限增长）、并发处理数、关闭时等待队列清空的最长秒数
+ACTIVITY_LOG_QUEUE_MAXSIZE = 10_000
+ACTIVITY_LOG_CONCURRENCY = 32
+ACTIVITY_LOG_DRAIN_TIMEOUT = 5.0
+
+# 未启用队列（lifespan 未运行）时直接创建的任务，持有引用防止被垃圾回收
+_activity_log_tasks: set[asyncio.Task] = set()
+
+
+async def log_activity(username: str) -> None:
+    """
+    记录用户活动日志
+    """
+    await asyncio.sleep(2) # 模拟耗时操作
+    logger.info("日志记录: 用户 %s 完成了高级演示调用", username)
+
+
+def enqueue_activity_log(queue: asyncio.Queue | None, username: str) -> bool:
+    """
+    提交一条活动日志，立即返回
+
+    - queue 为 None（未经 lifespan 启动，如未使用 with 的 TestClient）时直接创建后台任务
+    - 队列已满时丢弃该条并告警
+
+    Returns:
+        是否已提交
+    """
+    if queue is None:
+        task = asyncio.create_task(log_activity(username))
+        _activity_log_tasks.add(task)
+        task.add_done_callback(_activity_log_tasks.discard)
+        return True
+    try:
+        queue.put_nowait(username)
+    except asyncio.QueueFull:
+        logger.warning("活动日志队列已满，丢弃: 用户 %s", username)
+        return False
+    return True
+
+
+async def _activity_log_worker(queue: asyncio.Queue) -> None:
+    """逐条处理队列中的用户名"""
+    while True:
+        username = await queue.get()
+        try:
+            await log_activity(username)
+        except Exception:
+            logger.exception("日志记录失败: 用户 %s", username)
+        finally:
+            queue.task_done()
+
+
+async def activity_log_consumer(
+    queue: asyncio.Queue,
+    concurrency: int = ACTIVITY_LOG_CONCURRENCY,
+) -> None:
+    """
+    活动日志消费协程：在应用生命周期内常驻，由 concurrency 个工作协程并发处理队列
+
+    取消本协程时 TaskGroup 会一并取消所有工作协程
+    """
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(concurrency):
+            tg.create_task(_activity_log_worker(queue))
@@ -0,0 +1,56 @@
+"""
+进程内缓存工具
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    带过期时间的 LRU 缓存（进程内，非线程安全，供事件循环内使用）
+
+    - 超过 maxsize 时淘汰最久未使用的条目
+    - 条目写入 ttl 秒后失效
+
+    使用示例:
+        cache = TTLCache(maxsize=1024, ttl=5)
+        cache.set(1, {"id": 1})
+        cache.get(1)
+        cache.pop(1)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取未过期的缓存值，不存在或已过期返回 default"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存值"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """移除缓存值（数据变更时调用）"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,11 +1,14 @@
 """
 SQL 日志记录模块
 记录所有数据库查询语句到文件
+
+日志记录只放入内存队列，由后台线程写入文件，避免文件 I/O 阻塞事件循环
 """
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from src.common.config import settings
 
@@ -14,6 +17,9 @@ class SQLLogger:
     """SQL 日志记录器"""
     
     def __init__(self):
+        self.enabled = settings.SQL_LOG_ENABLED
+        self._listener: QueueListener | None = None
+        self._listener_running = False
         self.logger = self._setup_logger()
     
     def _setup_logger(self) -> logging.Logger:
@@ -48,11 +54,33 @@ class SQLLogger:
         )
         file_handler.setFormatter(formatter)
         
-        # 添加处理器
-        logger.addHandler(file_handler)
+        # 添加处理器：记录器只挂队列处理器，文件处理器由后台线程的监听器调用
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        self._listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
         
         return logger
+
+    def start(self):
+        """启动后台写文件线程（应用启动时调用，重复调用无副作用）"""
+        if self._listener is not None and not self._listener_running:
+            self._listener.start()
+            self._listener_running = True
+
+    def stop(self):
+        """停止后台写文件线程，停止前写完队列中剩余的记录（应用关闭时调用）"""
+        if self._listener is not None and self._listener_running:
+            self._listener.stop()
+            self._listener_running = False
     
+    def is_enabled(self) -> bool:
+        """
+        是否记录 SQL 语句（SQL_LOG_ENABLED 开启且 INFO 级别可用）
+
+        QueueHandler 会在调用方线程格式化记录，关闭时调用方应据此跳过语句清理和日志调用
+        """
+        return self.enabled and self.logger.isEnabledFor(logging.INFO)
+
     def log_sql(self, sql: str, params: dict | None = None, execution_time: float = 0):
         """
         记录 SQL 语句
@@ -62,12 +90,13 @@ class SQLLogger:
             params: 查询参数
             execution_time: 执行时间（毫秒）
         """
+        if not self.is_enabled():
+            return
+        # 使用 % 参数，由日志系统在真正输出时再格式化
         if params:
-            log_msg = f"SQL: {sql} | Params: {params} | Time: {execution_time:.2f}ms"
+            self.logger.info("SQL: %s | Params: %s | Time: %.2fms", sql, params, execution_time)
         else:
-            log_msg = f"SQL: {sql} | Time: {execution_time:.2f}ms"
-        
-        self.logger.info(log_msg)
+            self.logger.info("SQL: %s | Time: %.2fms", sql, execution_time)
     
     def log_error(self, sql: str, error: Exception):
         """
@@ -77,7 +106,7 @@ class SQLLogger:
             sql: SQL 语句
             error: 异常信息
         """
-        self.logger.error(f"SQL Error: {sql} | Exception: {str(error)}")
+        self.logger.error("SQL Error: %s | Exception: %s", sql, error)
 
 
 # 全局 SQL 日志记录器实例
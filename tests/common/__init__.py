@@ -0,0 +1 @@
+# Common 模块测试
@@ -0,0 +1,19 @@
+"""
+分页工具测试
+"""
+from src.common.pagination import PaginationParams, calculate_page_info
+
+
+def test_pagination_offset():
+    """测试偏移量计算"""
+    params = PaginationParams(page=3, page_size=20)
+    assert params.offset == 40
+    assert params.model_dump() == {"page": 3, "page_size": 20}
+
+
+def test_calculate_page_info():
+    """测试总页数向上取整"""
+    assert calculate_page_info(total=0, page=1, page_size=10).total_pages == 0
+    assert calculate_page_info(total=10, page=1, page_size=10).total_pages == 1
+    assert calculate_page_info(total=11, page=1, page_size=10).total_pages == 2
+    assert calculate_page_info(total=2**53 + 1, page=1, page_size=1).total_pages == 2**53 + 1
@@ -0,0 +1,68 @@
+"""
+Item 读取缓存失效测试
+
+使用临时文件 SQLite（每个会话独立连接）模拟“写会话提交前，其他会话读取旧行并重新写入缓存”的竞态
+"""
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.demo import service
+from src.demo.models import Item
+from src.demo.schemas import ItemCreate, ItemUpdate
+from src.common.exceptions import NotFoundException
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """临时文件 SQLite 会话工厂，读写会话使用不同连接，读不到未提交的数据"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'items.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Item.__table__.create)
+    service._item_cache.clear()
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    service._item_cache.clear()
+    await engine.dispose()
+
+
+async def _create_item(session_factory) -> int:
+    async with session_factory() as db:
+        item = await service.create_item(db, ItemCreate(name="cache", price=1.0))
+        await db.commit()
+    return item["id"]
+
+
+async def test_update_then_get_not_stale(session_factory):
+    """更新提交后，提交前被其他会话重新缓存的旧值应失效"""
+    item_id = await _create_item(session_factory)
+
+    async with session_factory() as writer:
+        await service.update_item(writer, item_id, ItemUpdate(name="updated"))
+        # 提交前的并发读取把旧值写回缓存
+        async with session_factory() as reader:
+            stale = await service.get_item_by_id(reader, item_id)
+        assert stale["name"] == "cache"
+        await writer.commit()
+
+    assert service._item_cache.get(item_id) is None
+    async with session_factory() as reader:
+        item = await service.get_item_by_id(reader, item_id)
+    assert item["name"] == "updated"
+
+
+async def test_delete_then_get_not_found(session_factory):
+    """删除提交后，缓存中不应残留已删除的 Item"""
+    item_id = await _create_item(session_factory)
+
+    async with session_factory() as writer:
+        await service.delete_item(writer, item_id)
+        async with session_factory() as reader:
+            await service.get_item_by_id(reader, item_id)
+        await writer.commit()
+
+    assert service._item_cache.get(item_id) is None
+    async with session_factory() as reader:
+        with pytest.raises(NotFoundException):
+            await service.get_item_by_id(reader, item_id)
@@ -0,0 +1,2 @@
+# 用户模块测试
+
@@ -0,0 +1,43 @@
+"""
+原生 SQL 创建用户测试
+
+使用临时文件 SQLite 分别走 INSERT ... RETURNING 和“插入 + 按 lastrowid 查询”两条分支
+"""
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.projectApi.models import User
+from src.projectApi.schemas import UserCreate
+from src.projectApi.service import create_user_raw
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """只包含 users 表的临时 SQLite 引擎"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("insert_returning", [True, False])
+async def test_create_user_raw(engine, insert_returning):
+    """两条分支都返回完整的用户行，账号状态列使用模型默认值"""
+    engine.dialect.insert_returning = insert_returning
+    async with async_sessionmaker(engine)() as db:
+        user = await create_user_raw(db, UserCreate(openid="wx_openid_1", nickname="raw"))
+        await db.commit()
+
+    assert user["id"] == 1
+    assert user["openid"] == "wx_openid_1"
+    assert user["nickname"] == "raw"
+    assert user["language"] == "zh_CN"
+    assert user["user_type"] == 1
+    assert user["status"] == 1
+    assert user["is_active"]
+    assert user["register_source"] == "miniprogram"
+    assert user["created_at"] is not None
@@ -0,0 +1 @@
+# Utils 模块测试
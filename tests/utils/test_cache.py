@@ -0,0 +1,30 @@
+"""
+进程内缓存测试
+"""
+from src.utils.cache import TTLCache
+
+
+def test_ttl_cache_lru_eviction():
+    """测试超过容量时淘汰最久未使用的条目"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+def test_ttl_cache_expiry_and_pop():
+    """测试过期和主动失效"""
+    cache = TTLCache(maxsize=8, ttl=0)
+    cache.set(1, "a")
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+    cache = TTLCache(maxsize=8, ttl=60)
+    cache.set(1, "a")
+    cache.pop(1)
+    cache.pop(2)
+    assert cache.get(1) is None